@@ -4,13 +4,7 @@ Example of application of MLForge to a simple case.
 (C) J. Renero, 2024
 
 """
-import numpy as np
-import pandas as pd
-import sys
-import os
-
-sys.path.insert(0, os.path.abspath(
-    os.path.join(os.path.dirname(__file__), '..')))
+import functools
 
 from mlforge.mlforge import Pipeline
 
@@ -24,9 +18,17 @@ from mlforge.mlforge import Pipeline
 
 
 class Host:
-    def __init__(self, param1, param2):
+    def __init__(self, param1, param2, seed=None):
         self.param1 = param1
         self.param2 = param2
+        self.seed = seed
+
+    @functools.cached_property
+    def X(self):
+        # Built only the first time a step uses it, so NumPy is imported only then.
+        import numpy as np
+        rng = np.random.default_rng(self.seed)
+        return rng.integers(0, 100, size=(100, 4), dtype=np.int8)
 
     def host_method(self):
         return "Host.host_method"
@@ -48,6 +50,8 @@ class Host:
 
 
 class SampleClass:
+    __slots__ = ('param1', 'param2', 'fitted')
+
     def __init__(self, param1=None, param2=False):
         self.param1 = param1
         self.param2 = param2
@@ -74,6 +78,7 @@ def example2():
         ('r1', 'm1'),
         ('r2', 'm2', {'msg': 'new_what_value'}),
         ('r3', 'm2', {'msg': host.param1}),
+        ('r4', 'm3', {'msg': 'X'}),
         ('myobject2', SampleClass, {'param2': True}),
         ('myobject2.fit'),
         'myobject2.method',
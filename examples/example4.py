@@ -3,6 +3,9 @@
 Example of application of MLForge to a simple case.
 (C) J. Renero, 2024
 
+Stages of a pipeline are plain Python calls, so heavy inner loops should be
+delegated to NumPy (`numeric_method`) or compiled with Numba (`fast_method`).
+
 """
 # pylint: disable=E1101:no-member, W0201:attribute-defined-outside-init, W0511:fixme
 # pylint: disable=C0103:invalid-name, W0611:unused-import
@@ -12,24 +15,59 @@ Example of application of MLForge to a simple case.
 # pylint: disable=W0106:expression-not-assigned, R1702:too-many-branches
 
 import time
-import os
-import sys
-
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from mlforge.mlforge import Pipeline
 from mlforge.progbar import ProgBar
 
+try:
+    import numpy as np
+except ImportError:
+    # NumPy is optional: without it, `numeric_method` sums in plain Python.
+    np = None
+
+try:
+    from numba import njit
+except ImportError:
+    # Numba is optional: without it, the kernel below runs as plain Python.
+    def njit(*args, **kwargs):
+        return lambda func: func
+
+
+# Compiled eagerly for the given signature, and cached on disk (in the folder set
+# by NUMBA_CACHE_DIR, or __pycache__ by default) so that later runs skip the JIT.
+@njit("float64(int64, float64)", cache=True, fastmath=True)
+def _kernel(num_steps, work):
+    acc = 0.0
+    for i in range(num_steps):
+        acc += work * (i % 7) / (1.0 + i)
+    return acc
+
 
 class SlowClass:
+    __slots__ = ()
+
     def __init__(self):
         pass
 
+    def fast_method(self, num_steps, work):
+        return _kernel(num_steps, work)
+
+    def numeric_method(self, n):
+        if np is None:
+            return float(sum(range(n)))
+        # One call into NumPy's C loop instead of n Python iterations.
+        return float(np.arange(n, dtype=np.float64).sum())
+
     def slow_method(self, num_steps, delay):
         p = ProgBar().start_subtask("slow_method", num_steps)
-        for i in range(num_steps):
-            time.sleep(delay)
-            p.update_subtask("slow_method", i+1)
+        # Sleep and update the progress bar in batches of 1% of the steps.
+        batch = max(1, num_steps // 100)
+        done = 0
+        while done < num_steps:
+            n = min(batch, num_steps - done)
+            time.sleep(n * delay)
+            done += n
+            p.update_subtask("slow_method", done)
         p.remove("slow_method")
 
 class Example:
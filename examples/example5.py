@@ -5,11 +5,6 @@ Example of application of MLForge to a simple case.
 
 """
 from sample_classes import HostClass, SampleClass
-import sys
-import os
-
-sys.path.insert(0, os.path.abspath(
-    os.path.join(os.path.dirname(__file__), '..')))
 
 from mlforge.mlforge import Pipeline, Stage
 
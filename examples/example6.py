@@ -12,45 +12,54 @@ Example of application of MLForge to a simple case.
 # pylint: disable=W0106:expression-not-assigned, R1702:too-many-branches
 
 import time
-import os
-import sys
-
-sys.path.insert(0, os.path.abspath(
-    os.path.join(os.path.dirname(__file__), '..')))
 
 from mlforge.progbar import ProgBar
 from mlforge.mlforge import Pipeline, Stage
 
 
 class SlowClass:
+    __slots__ = ()
+
     def __init__(self):
         pass
 
     def slow_method(self, num_steps, delay):
         p = ProgBar().start_subtask("slow_method", num_steps)
-        for i in range(num_steps):
-            time.sleep(delay)
-            p.update_subtask("slow_method", i+1)
+        # Sleep and update the progress bar in batches of 1% of the steps.
+        batch = max(1, num_steps // 100)
+        done = 0
+        while done < num_steps:
+            n = min(batch, num_steps - done)
+            time.sleep(n * delay)
+            done += n
+            p.update_subtask("slow_method", done)
         p.remove("slow_method")
 
 
 class SlowPredictClass:
+    __slots__ = ('myname',)
+
     def __init__(self):
         self.myname="SlowPredictClass"
 
     def slow_method(self, num_steps, delay):
         p = ProgBar().start_subtask("slow_predict", num_steps)
-        for i in range(num_steps):
-            time.sleep(delay)
-            p.update_subtask("slow_predict", i+1)
+        # Sleep and update the progress bar in batches of 1% of the steps.
+        batch = max(1, num_steps // 100)
+        done = 0
+        while done < num_steps:
+            n = min(batch, num_steps - done)
+            time.sleep(n * delay)
+            done += n
+            p.update_subtask("slow_predict", done)
         p.remove("slow_predict")
 
 
 class Fit:
     def __init__(self):
-        self.pipeline = Pipeline(subtask=True, description="Fit")
-        self.pipeline.from_config(
-            "/Users/renero/phd/code/mlforge/examples/.config6.yaml")
+        self.pipeline = Pipeline.get_or_build(
+            "/Users/renero/phd/code/mlforge/examples/.config6.yaml",
+            subtask=True, description="Fit")
 
     def run(self):
         self.pipeline.run()
@@ -58,13 +67,13 @@ class Fit:
 
 class Predict:
     def __init__(self):
-        self.pipeline = Pipeline(subtask=True, description="Predict")
         stage1 = Stage(attribute_name="slow_object", class_name=SlowPredictClass)
         stage2 = Stage(method_name="slow_object.slow_method",
                        arguments={"num_steps": 10, "delay": 0.1})
         stage3 = Stage(method_name="slow_object.slow_method",
                           arguments={"num_steps": 10, "delay": 0.1})
-        self.pipeline.add_stages([stage1, stage2, stage3])
+        self.pipeline = Pipeline.get_or_build(
+            stages=[stage1, stage2, stage3], subtask=True, description="Predict")
 
     def run(self):
         self.pipeline.run()
@@ -8,6 +8,10 @@
 # pylint: disable=R0914:too-many-locals, R0915:too-many-statements
 # pylint: disable=W0106:expression-not-assigned, R1702:too-many-branches
 
+import logging
+
+log = logging.getLogger(__name__)
+
 
 class HostClass:
     def __init__(self, param1=None, param2=None):
@@ -15,27 +19,28 @@ class HostClass:
         self.param2 = param2
 
     def host_method(self, param1=None, param2=None):
-        print(f"  > Calling the method \'my_method()\'\n"
-              f"    > I got params: param1={param1}, param2={param2}")
+        log.debug("Calling the method 'my_method()' with params: "
+                  "param1=%s, param2=%s", param1, param2)
         self.param1 = param1
         self.param2 = param2
-        return f"host_method({param1}, {param2})"
+        return "host_method(%s, %s)" % (param1, param2)
 
 
 class SampleClass:
+    __slots__ = ('param1', 'param2')
+
     def __init__(self, param1=None, param2=False):
         self.param1 = param1
         self.param2 = param2
-        print(f"  > Called the init of class {self.__class__}\n"
-              f"    > I got params: {self.param1}, {self.param2}")
+        log.debug("Called the init of class %s with params: %s, %s",
+                  self.__class__, self.param1, self.param2)
 
     @staticmethod
     def method(param1:str, param2:str):
-        print(
-            f"  > Called static method \'{SampleClass.method.__name__}\'")
+        log.debug("Called static method '%s'", SampleClass.method.__name__)
         return "Hi"
 
     def object_method(self):
-        print(f"  > Called object method {self.object_method.__name__}\n"
-              f"    > I have params: {self.param1}, {self.param2}")
+        log.debug("Called object method %s with params: %s, %s",
+                  self.object_method.__name__, self.param1, self.param2)
         return "there!"
@@ -3,9 +3,14 @@ This module contains the LogConfig class, which is used to configure logging
 for the pipeline.
 """
 
+import functools
 import logging
 import time
 
+# The timezone and the format of the log lines are fixed for the whole process.
+_TZ = time.strftime('%z')
+_FORMAT = '%(asctime)s' + _TZ + ' %(levelname)s %(message)s'
+
 
 class LogConfig:
     """
@@ -13,6 +18,7 @@ class LogConfig:
     """
 
     @staticmethod
+    @functools.lru_cache(maxsize=None)
     def setup_logging(
         name: str = None,
         level: str = "info",
@@ -20,7 +26,10 @@ class LogConfig:
         caller_filename: str = None
     ):
         """
-        Set up logging for the pipeline.
+        Set up logging for the pipeline. The file handler is attached to the
+        named logger only once, and calls with the same arguments return the
+        same logger without configuring it again. The root logger is never
+        modified.
 
         Parameters:
         ------------
@@ -45,13 +54,12 @@ class LogConfig:
         log_fname = fname if fname is not None else \
             f".{log_name}.log"
 
-        tz = time.strftime('%z')
-        fmt = '%(asctime)s' + tz + ' %(levelname)s %(message)s'
-        logging.basicConfig(
-            level=log_level,
-            format=fmt,
-            filename=log_fname,
-            encoding="utf-8",
-        )
-        
-        return logging.getLogger(log_name)
+        logger = logging.getLogger(log_name)
+        logger.setLevel(log_level)
+        if not logger.handlers:
+            handler = logging.FileHandler(
+                log_fname, encoding="utf-8", delay=True)
+            handler.setFormatter(logging.Formatter(_FORMAT))
+            logger.addHandler(handler)
+
+        return logger
@@ -11,41 +11,410 @@ Pipeline class to define and run several execution steps.
 # pylint: disable=R0913:too-many-arguments, R0903:too-few-public-methods
 # pylint: disable=R0914:too-many-locals, R0915:too-many-statements
 # pylint: disable=W0106:expression-not-assigned, R1702:too-many-branches
-# pylint: disable=W0212:protected-access
+# pylint: disable=W0212:protected-access, W0122:exec-used
 
+import collections
+import concurrent.futures
+import dataclasses
+import functools
+import hashlib
 import importlib
 import inspect
+import itertools
 import logging
+import operator
+import os
+import pickle
+import queue
+import sys
+import threading
 import time
 import types
-import typing
-from dataclasses import asdict, dataclass
+import weakref
 from importlib import import_module
-from random import getrandbits
-from typing import Any, Callable, List, Union
+from typing import TYPE_CHECKING, Any, Callable, List, Union
 
 import yaml
 from rich import print as rp
-from rich.columns import Columns
-from rich.table import Table
 
 from mlforge.logconfig import LogConfig
-from mlforge.progbar import ProgBar
 
+if TYPE_CHECKING:
+    from mlforge.progbar import ProgBar
 
-@dataclass
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+# Names bound by the imports above. Parameters and methods of the stages are
+# never looked up among them, since they are not meant for the stages.
+_IMPORTED_NAMES = frozenset(globals())
+
+
+@dataclasses.dataclass(slots=True)
 class Stage:
     _num: int = None
     _id: str = None
     attribute_name: str = None
     method_name: str = None
-    _method_call: callable = None
+    _method_call: Callable = None
     class_name: type = None
     _parameters: dict = None
     arguments: dict = None
     _timestamp_start: float = None
     _timestamp_end: float = None
     _duration: float = None
+    memoize: bool = None
+    jit: bool = None
+    depends_on: list = None
+    _obj_name: str = None
+    _obj_getter: Callable = None
+    _kind: int = None
+    _prebound: dict = None
+    _runner: Callable = None
+    _runner_inputs: tuple = None
+
+
+# Use the C implementation of the YAML loader when present, since it is much
+# faster than the pure Python one.
+_YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+# Default for attribute lookups, to tell a missing attribute from one set to
+# None with a single `getattr` call.
+_MISSING = object()
+
+# Source of the ids of the stages, unique within the process.
+_STAGE_IDS = itertools.count()
+
+# Attributes found in the class dictionaries, indexed by class and name, as
+# computed by `_class_lookup`. The table is emptied when it grows beyond
+# `_CLASS_LOOKUPS_SIZE` entries, so that it does not keep classes alive forever.
+_class_lookups = {}
+_CLASS_LOOKUPS_SIZE = 1024
+
+# Classes as defined in their modules, indexed by the names of the module and
+# the class, along with the dictionary of the module they were found in, as
+# computed by `_resolve_class_method`. Emptied as `_class_lookups` is.
+_module_classes = {}
+
+# Line printed between stages in verbose mode.
+_SEPARATOR = "-" * 100
+
+# Containers with more items than this are summarized by `show()`.
+_SHOW_MAX_ITEMS = 10
+
+
+def _summary(value: Any) -> Any:
+    """
+    Summarize large containers, like lists or arrays passed as arguments, by
+    their type and length, so that `show()` does not build their full repr.
+    """
+    if isinstance(value, (str, bytes)) or not hasattr(value, '__len__'):
+        return value
+    try:
+        length = len(value)
+    except TypeError:
+        return value
+    if length > _SHOW_MAX_ITEMS:
+        return f"{type(value).__name__} of length {length}"
+    return value
+
+
+def _digest(payload: bytes) -> bytes:
+    """
+    Compute a 128-bit, non-cryptographic digest of the payload, with xxHash when
+    it is installed, or BLAKE2b otherwise.
+    """
+    if xxhash is not None:
+        return xxhash.xxh3_128_digest(payload)
+    return hashlib.blake2b(payload, digest_size=16).digest()
+
+
+@functools.lru_cache(maxsize=32)
+def _read_config(
+        config_filename: str,
+        size: int,
+        mtime_ns: int,
+        cache_dir: str) -> bytes:
+    """
+    Read the YAML configuration file into a pickled payload, from the cache in
+    `cache_dir` if the file has not changed since it was cached, unless
+    `cache_dir` is None. Results are memoized by file path, size and
+    modification time.
+    """
+    if cache_dir is None:
+        with open(config_filename, 'r', encoding='utf-8') as file:
+            return pickle.dumps(yaml.load(file, Loader=_YAML_LOADER))
+
+    signature = f"{config_filename}:{size}:{mtime_ns}"
+    digest = hashlib.blake2b(signature.encode(), digest_size=16).hexdigest()
+    cache_filename = os.path.join(cache_dir, f"{digest}.pkl")
+
+    try:
+        with open(cache_filename, 'rb') as file:
+            payload = file.read()
+        pickle.loads(payload)
+        return payload
+    except (OSError, EOFError, pickle.UnpicklingError):
+        pass
+
+    with open(config_filename, 'r', encoding='utf-8') as file:
+        payload = pickle.dumps(yaml.load(file, Loader=_YAML_LOADER))
+
+    # Write the cache atomically, so that concurrent loads never read a
+    # partial file. Failing to write the cache is not an error.
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp_filename = f"{cache_filename}.{os.getpid()}.tmp"
+        with open(tmp_filename, 'wb') as file:
+            file.write(payload)
+        os.replace(tmp_filename, cache_filename)
+    except OSError:
+        pass
+
+    return payload
+
+
+@functools.lru_cache(maxsize=512)
+def _signature_defaults(method_call: Callable, bound: bool = False) -> dict:
+    """
+    Get the parameters of a callable and their default values. If `bound` is
+    True, the first positional parameter, the one a method is bound to, is left
+    out. Results are memoized, so callers must not modify the returned dict.
+    """
+    parameters = list(inspect.signature(method_call).parameters.values())
+    if bound and parameters and parameters[0].kind in (
+            inspect.Parameter.POSITIONAL_ONLY,
+            inspect.Parameter.POSITIONAL_OR_KEYWORD):
+        parameters = parameters[1:]
+    return {parameter.name: parameter.default for parameter in parameters}
+
+
+@functools.lru_cache(maxsize=None)
+def _attr_getter(path: str) -> Callable:
+    """
+    Return an `operator.attrgetter` for the given dotted path. Getters are
+    memoized, so that every pipeline referencing the same path shares them.
+    """
+    return operator.attrgetter(path)
+
+
+def _class_lookup(klass: type, name: str) -> list:
+    """
+    Look a name up in the dictionaries of a class and its bases, so that no
+    property or other descriptor is evaluated.
+
+    Lookups are cached by class and name, and a cached one is used only while
+    the class that defined the name still holds the same value, none of the
+    classes before it in the MRO defines the name, and the MRO is the same, so
+    that methods patched or reassigned on the classes are seen.
+
+    Returns
+    -------
+    entry: list
+        The MRO, the dictionary of the class that defines the name (None if
+        none does), the dictionaries of the classes before it, the value found
+        (`_MISSING` if none) and the value returned by `getattr` on the class,
+        filled by `_resolve_class_method` (`_MISSING` until then).
+    """
+    mro = klass.__mro__
+    entry = _class_lookups.get((klass, name))
+    if entry is not None and entry[0] is mro:
+        owner, shadows, value = entry[1], entry[2], entry[3]
+        if owner is None or owner.get(name, _MISSING) is value:
+            for namespace in shadows:
+                if name in namespace:
+                    break
+            else:
+                return entry
+
+    shadows = []
+    owner, value = None, _MISSING
+    for base in mro:
+        namespace = base.__dict__
+        if name in namespace:
+            owner, value = namespace, namespace[name]
+            break
+        shadows.append(namespace)
+    if len(_class_lookups) >= _CLASS_LOOKUPS_SIZE:
+        _class_lookups.clear()
+    entry = _class_lookups[(klass, name)] = [
+        mro, owner, tuple(shadows), value, _MISSING]
+    return entry
+
+
+def _host_callable(host_class: type, name: str) -> Any:
+    """
+    Get the function, static or class method defined with the given name by a
+    class or its bases. Return None if the closest definition of the name is
+    something else.
+    """
+    value = _class_lookup(host_class, name)[3]
+    if isinstance(value, (types.FunctionType, staticmethod, classmethod)):
+        return value
+    return None
+
+
+def _resolve_class_method(class_name: type, method_name: str = None) -> Callable:
+    """
+    Get a method of a class, or the class itself, as defined in its module, if
+    `method_name` is None. Return None if the class has no such method.
+
+    Methods are not cached, since `getattr` on a class is already served by
+    the attribute cache of the interpreter, which sees patched methods.
+    Classes are cached by module and name, and a cached one is used only while
+    the module still holds it under that name, so that the module is imported
+    at most once and classes rebound in it are seen.
+    """
+    if method_name is not None:
+        method = getattr(class_name, method_name, _MISSING)
+        return None if method is _MISSING else method
+    key = (class_name.__module__, class_name.__name__)
+    cached = _module_classes.get(key)
+    if cached is not None:
+        namespace, klass = cached
+        if namespace.get(key[1], _MISSING) is klass:
+            return klass
+    module = import_module(key[0])
+    klass = getattr(module, key[1])
+    namespace = vars(module)
+    if namespace.get(key[1], _MISSING) is klass:
+        if len(_module_classes) >= _CLASS_LOOKUPS_SIZE:
+            _module_classes.clear()
+        _module_classes[key] = (namespace, klass)
+    return klass
+
+
+def _global(name: str, default: Any = None) -> Any:
+    """
+    Get a global of this module that the stages can take methods and the
+    values of their parameters from, or `default` if there is none: the public
+    names defined in it or set on it, but not the modules and names it imports,
+    nor its private names.
+    """
+    if name in _IMPORTED_NAMES or name.startswith('_'):
+        return default
+    return globals().get(name, default)
+
+
+def _intern(value: Any) -> Any:
+    """
+    Intern a value if it is a string, or return it as it is.
+    """
+    return sys.intern(value) if type(value) is str else value
+
+
+def _intern_arguments(arguments: dict) -> dict:
+    """
+    Intern the names and the string values of the arguments of a stage, since
+    values can be names of objects, looked up on every run.
+    """
+    if not isinstance(arguments, dict):
+        return arguments
+    return {_intern(k): _intern(v) for k, v in arguments.items()}
+
+
+def _no_op(*_args, **_kwargs):
+    return None
+
+
+def _njit(function: Callable) -> Callable:
+    """
+    Compile a function with Numba, keeping the compiled code in its disk cache
+    when the function is defined in a file.
+    """
+    try:
+        return numba.njit(cache=True)(function)
+    except RuntimeError:
+        # Functions not defined in a file cannot use the disk cache
+        return numba.njit(function)
+
+
+def _njit_or_python(function: Callable) -> Callable:
+    """
+    Compile a function with Numba, calling the function itself, from then on,
+    if Numba cannot compile it for the arguments it is first called with.
+    Numba compiles before running any code, so the function never runs twice.
+    """
+    compiled = _njit(function)
+
+    @functools.wraps(function)
+    def call(*args, **kwargs):
+        nonlocal compiled
+        if compiled is not None:
+            try:
+                return compiled(*args, **kwargs)
+            except numba.core.errors.NumbaError:
+                compiled = None
+        return function(*args, **kwargs)
+
+    return call
+
+
+# Marks the end of the items flowing between the stages of a stream.
+_END_OF_STREAM = object()
+
+
+# Kinds of the most common types of the elements of a forge step.
+_STEP_KINDS = {str: 's', type: 'c', dict: 'd'}
+
+
+def _step_element_kind(element: Any) -> str:
+    """
+    Classify an element of a forge step as a string ('s'), a class ('c'), a
+    dictionary of arguments ('d'), or anything else ('x').
+    """
+    kind = _STEP_KINDS.get(type(element))
+    if kind is not None:
+        return kind
+    if isinstance(element, str):
+        return 's'
+    if isinstance(element, type):
+        return 'c'
+    if isinstance(element, dict):
+        return 'd'
+    return 'x'
+
+
+# Where each element of a forge step goes, given the kinds of its elements, as
+# the positions of the attribute name, method name, class and arguments. The
+# second layout, if any, is used when the first element is not a method of the
+# class in the second one.
+_STEP_LAYOUTS = {
+    ('s',): ((None, 0, None, None), None),
+    ('c',): ((None, None, 0, None), None),
+    ('s', 'c'): ((None, 0, 1, None), (0, None, 1, None)),
+    ('s', 'd'): ((None, 0, None, 1), None),
+    ('s', 's'): ((0, 1, None, None), None),
+    ('s', 's', 'c'): ((0, 1, 2, None), None),
+    ('s', 's', 'd'): ((0, 1, None, 2), None),
+    ('s', 'c', 'd'): ((None, 0, 1, 2), (0, None, 1, 2)),
+    ('s', 's', 'c', 'd'): ((0, 1, 2, 3), None),
+}
+
+# Error messages for the forge steps that do not match any layout.
+_STEP_ERRORS = {
+    1: "Parameter '{}' must be a string or a class",
+    2: "Tuple '{}' with 2 elements must be either "
+       "(str, class), (str, str) or (str, dict)",
+    3: "Tuple '{}' with 3 elements must be either "
+       "(str, str, class), (str, str, dict) or (str, class, dict)",
+    4: "Tuple '{}' with 4 elements must be (str, str, class, dict)",
+}
+
+
+# Kinds of callables a stage can resolve to. Stages are classified once, when
+# they are resolved, so that running them does not inspect the callable again.
+_KIND_FUNCTION = 1
+_KIND_CLASS = 2
+_KIND_HOST_METHOD = 3
+_KIND_DOTTED = 4
 
 
 class Pipeline:
@@ -82,8 +451,27 @@ class Pipeline:
         Flag indicating whether to display verbose output.
     silent: bool
         Flag indicating whether to disable the progress bar.
+    max_workers: int
+        If set, stages that do not depend on each other run concurrently, in a
+        pool with this number of threads. By default, stages run one after
+        another.
+    jit: bool
+        Flag indicating whether to compile with Numba the functions of the
+        stages that do not set `jit` themselves. Those that Numba cannot
+        compile run as regular Python code.
     """
 
+    # Values returned by memoized stages, shared by all pipelines and indexed by
+    # a hash of the callable, the object it is bound to and the arguments passed
+    # to it. Only the `_memo_size` most recently used values are kept.
+    _memo = collections.OrderedDict()
+    _memo_size = 256
+    _memo_lock = threading.Lock()
+
+    # Live pipelines built through `get_or_build`, indexed by the configuration
+    # (or stages) and the arguments used to build them.
+    _pool = weakref.WeakValueDictionary()
+
     def __init__(
             self,
             host: type = None,
@@ -94,12 +482,15 @@ class Pipeline:
             description: str = None,
             subtask: bool = False,
             verbose: bool = False,
-            silent: bool = False):
-
-        # First thing is knowing who is calling the pipeline.
-        caller = inspect.stack()[1]
-        self.caller_module = caller.frame.f_globals['__name__']
-        self.caller_filename = caller[0].f_code.co_filename
+            silent: bool = False,
+            max_workers: int = None,
+            jit: bool = False):
+
+        # First thing is knowing who is calling the pipeline. Only the frame of
+        # the caller is needed, so the rest of the stack is not inspected.
+        caller = sys._getframe(1)
+        self.caller_module = caller.f_globals['__name__']
+        self.caller_filename = caller.f_code.co_filename
         self.caller_filename = self.caller_filename.split('/')[-1]
 
         self.host = host
@@ -109,10 +500,18 @@ class Pipeline:
         self.description = description
         self.subtask = subtask
         self.silent = silent
+        self.max_workers = max_workers
+        self.jit = jit
         self.attributes_ = {}
         self.objects_ = {'host': self.host}
         self.pbar = None
+        # Called by the stages with the number of steps done, see `_pbar_create`.
+        self._pbar_step = _no_op
         self.run_ = False
+        self._resolved_host = self.host
+        self._run_compiled = None
+        self._compiled_stages = None
+        self._dependencies = None
 
         # Rules to sort out what to display
         if silent:
@@ -130,6 +529,77 @@ class Pipeline:
             name=log_name, level=log_level, fname=log_fname,
             caller_filename=self.caller_filename)
         self.logger.debug('Pipeline initialized')
+        if self.jit and numba is None:
+            self.logger.warning("Numba is not installed, stages are not compiled")
+
+    @classmethod
+    def get_or_build(
+            cls,
+            config_filename: str = None,
+            stages: list = None,
+            **kwargs) -> 'Pipeline':
+        """
+        Get a pipeline built with the same configuration file, or the same list
+        of stages, and the same arguments, as long as it is still alive. If
+        there is none, build a new one, so that the YAML parsing and the stage
+        resolution are done only once for all the pipelines that share them.
+
+        Parameters
+        ----------
+        config_filename: str
+            Name of the YAML configuration file to load the pipeline from.
+        stages: list
+            List of stages to be added to the pipeline, if no configuration file
+            is given.
+        kwargs: dict
+            Arguments passed to the constructor of the pipeline.
+
+        Returns
+        -------
+        pipeline: Pipeline
+            The pipeline loaded with the given configuration or stages.
+        """
+        assert (config_filename is None) != (stages is None), \
+            "Either a configuration file or a list of stages must be given"
+
+        # The caller is part of the key, since the classes named in the
+        # configuration are looked up in its module.
+        caller = sys._getframe(1)
+        caller_module = caller.f_globals['__name__']
+        if config_filename is not None:
+            # An edited file gives a new key, as in `_load_config`.
+            stat = os.stat(config_filename)
+            source = (os.path.abspath(config_filename),
+                      stat.st_size, stat.st_mtime_ns)
+        else:
+            source = tuple(cls._pool_stage_key(stage) for stage in stages)
+        key = (source, caller_module, tuple(sorted(kwargs.items())))
+        try:
+            hash(key)
+        except TypeError:
+            key = None
+        if config_filename is None and None in source:
+            key = None
+
+        pipeline = cls._pool.get(key) if key is not None else None
+        if pipeline is not None:
+            return pipeline
+
+        # The pipeline is built from here, so the caller must be set explicitly.
+        caller_filename = caller.f_code.co_filename.split('/')[-1]
+        kwargs.setdefault('log_name', caller_filename.replace('.py', ''))
+        pipeline = cls(**kwargs)
+        pipeline.caller_module = caller_module
+        pipeline.caller_filename = caller_filename
+        if config_filename is not None:
+            pipeline.pipeline = pipeline._process_config(
+                pipeline._load_config(config_filename), pipeline.caller_module)
+        else:
+            pipeline.add_stages(stages)
+
+        if key is not None:
+            cls._pool[key] = pipeline
+        return pipeline
 
     def close(self):
         """
@@ -162,23 +632,24 @@ class Pipeline:
 
         self._m(
             f"Into '{self.from_list.__name__}' with '{len(steps)}' steps")
+        # Methods called for every step, looked up once.
+        get_step_components = self._get_step_components
+        prepare_stage = self._prepare_stage
+        append = self.pipeline.append
         for step_number, step_name in enumerate(steps):
             # Create a new stage of type Stage, and initialize it with the step number
-            # and a random id.
-            stage = Stage(
-                step_number, f"{getrandbits(32):08x}",
-                None, None, None, None, None, None)
+            # and the next id from the process-wide `_STAGE_IDS` counter.
+            stage = Stage(step_number, f"{next(_STAGE_IDS):08x}")
 
             self._m(f"> Step #{step_number}({stage._id}) {str(step_name)}")
 
             # Get the method to be called, the parameters that the
             # method accepts and the arguments to be passed to the method.
             # The variable name is the name to be given to the result of the call.
-            # vble_name, step_call, step_parameters, step_arguments = \
-            #     self._get_step_components(step_name, stage)
-            stage = self._get_step_components(step_name, stage)
+            stage = get_step_components(step_name, stage)
+            prepare_stage(stage)
 
-            self.pipeline.append(stage)
+            append(stage)
 
     def from_config(self, config_filename: str):
         """
@@ -192,15 +663,42 @@ class Pipeline:
         self._m(f"Into '{self.from_config.__name__}' with "
                 f"config_filename='{config_filename}'")
 
-        with open(config_filename, 'r', encoding='utf-8') as file:
-            config = yaml.safe_load(file)
+        config = self._load_config(config_filename)
 
         # Retrieve the caller's module name
-        caller_module = inspect.stack()[1].frame.f_globals['__name__']
+        caller_module = sys._getframe(1).f_globals['__name__']
 
         # Process the config and set the pipeline steps
         self.pipeline = self._process_config(config, caller_module)
 
+    def _load_config(self, config_filename: str) -> dict:
+        """
+        Load a YAML configuration file. Within the same process, the parsed
+        configuration is kept in memory, keyed by the path, size and modification
+        time of the file, so that loading an unchanged file again skips the YAML
+        parsing. If the `MLFORGE_CACHE_DIR` environment variable is set, it is
+        also cached on disk, in that folder, for other processes. Cache files
+        are pickles, so the folder must only be writable by trusted users.
+
+        Parameters
+        ----------
+        config_filename: str
+            Name of the YAML configuration file.
+
+        Returns
+        -------
+        config: dict
+            Dictionary containing the YAML configuration.
+        """
+        stat = os.stat(config_filename)
+        cache_dir = os.environ.get('MLFORGE_CACHE_DIR') or None
+        payload = _read_config(
+            os.path.abspath(config_filename), stat.st_size, stat.st_mtime_ns,
+            cache_dir)
+
+        # Unpickle on every load, so that each pipeline gets its own copy.
+        return pickle.loads(payload)
+
     def add_stages(self, stages: list):
         """
         Add stages to the pipeline.
@@ -215,11 +713,64 @@ class Pipeline:
 
         # This method can be called wiht a pipeline that already has stages.
         last_idx = len(self.pipeline)
+        seen = {self._stage_key(stage) for stage in self.pipeline}
 
+        # Methods called for every stage, looked up once.
+        stage_key = self._stage_key
+        prepare_stage = self._prepare_stage
+        append = self.pipeline.append
         for idx, stage in enumerate(stages):
             stage._num = idx + last_idx
-            stage._id = f"{getrandbits(32):08x}"
-            self.pipeline.append(stage)
+            stage._id = f"{next(_STAGE_IDS):08x}"
+            if isinstance(stage.attribute_name, str):
+                stage.attribute_name = sys.intern(stage.attribute_name)
+            if isinstance(stage.method_name, str):
+                stage.method_name = sys.intern(stage.method_name)
+            stage.arguments = _intern_arguments(stage.arguments)
+
+            key = stage_key(stage)
+            if key is not None and key in seen:
+                self.logger.warning(
+                    "Stage #%03d(%s) repeats a previous invocation of '%s'",
+                    stage._num, stage._id, stage.method_name or stage.class_name)
+            seen.add(key)
+            prepare_stage(stage)
+            append(stage)
+
+    @classmethod
+    def _pool_stage_key(cls, stage: Stage) -> tuple:
+        """
+        Build the key that identifies a stage in the pool of `get_or_build`: the
+        invocation it does, as given by `_stage_key`, and the flags that change
+        how it runs. Returns None if the stage cannot be keyed.
+        """
+        key = cls._stage_key(stage)
+        if key is None:
+            return None
+        depends_on = None if stage.depends_on is None else tuple(stage.depends_on)
+        key = key + (stage.memoize, stage.jit, depends_on)
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
+    @staticmethod
+    def _stage_key(stage: Stage) -> tuple:
+        """
+        Build a hashable key that identifies the invocation made by a stage: the
+        attribute, method, class and arguments. Two stages with the same key do
+        the same call. Returns None if the arguments are not hashable.
+        """
+        try:
+            arguments = () if stage.arguments is None else \
+                tuple(sorted(stage.arguments.items()))
+            key = (stage.attribute_name, stage.method_name, stage.class_name,
+                   arguments)
+            hash(key)
+        except TypeError:
+            return None
+        return key
 
     def run(self, num_steps: int = None):
         """
@@ -237,57 +788,556 @@ class Pipeline:
         self._m(f"RUN pipeline with {len(self.pipeline)} steps")
 
         self.logger.info('Pipeline execution started')
-        for stage_nr, stage in enumerate(self.pipeline):
+        # Stages resolved against a different host must be resolved again.
+        if self.host is not self._resolved_host:
+            for stage in self.pipeline:
+                stage._method_call = None
+            self._resolved_host = self.host
+
+        # The pipeline is compiled again whenever its list of stages changes,
+        # including stages replaced in place.
+        compiled_stages = self._compiled_stages
+        if self._run_compiled is None or \
+                len(compiled_stages) != len(self.pipeline) or \
+                not all(map(operator.is_, compiled_stages, self.pipeline)):
+            self.compile()
+        self._run_compiled(self)
+
+        self._pbar_close()
+        # There are only bars to clear if this run created one.
+        if self.pbar is not None:
+            type(self.pbar).clear()
+        self.logger.info('Pipeline execution finished')
+        self.run_ = True
+
+    def run_stream(
+            self,
+            iterable_attr: str,
+            steps: list,
+            maxsize: int = 2) -> list:
+        """
+        Run a list of steps over each item of an iterable, with one thread per
+        step, so that each step processes an item while the previous one
+        processes the next. Each step is a function or method given as in
+        `from_list`, which is called with the item as its first argument and
+        whose return value is the item passed to the next step. The rest of
+        its parameters are built once, when the stream starts, as in `run()`.
+
+        Parameters
+        ----------
+        iterable_attr: str
+            Name of the host attribute, or of an object created by the pipeline,
+            with the items to be processed.
+        steps: list
+            List of steps to run on each item, in order.
+        maxsize: int
+            Number of items that can wait between two steps. A step that gets
+            ahead of the next one waits until there is room for its results.
+
+        Returns
+        -------
+        results: list
+            The values returned by the last step, in the order of the items.
+        """
+        assert steps, "List of steps is empty. No steps to run."
+        self._m(f"RUN stream over '{iterable_attr}' with {len(steps)} steps")
+
+        stages = []
+        for step_number, step_name in enumerate(steps):
+            stage = self._get_step_components(
+                step_name, Stage(step_number, f"{next(_STAGE_IDS):08x}"))
+            assert stage.attribute_name is None, \
+                f"Step '{step_name}' of a stream cannot set an attribute"
+            self._resolve_stage(stage)
+            assert stage._parameters, \
+                f"Step '{step_name}' of a stream must take the item as argument"
+            stages.append(stage)
+        items = self._get_object(iterable_attr)
+
+        queues = [queue.Queue(maxsize=maxsize) for _ in range(len(stages) + 1)]
+        failed = threading.Event()
+        errors = []
+
+        def feed():
+            try:
+                for item in items:
+                    if failed.is_set():
+                        break
+                    queues[0].put(item)
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                errors.append(e)
+                failed.set()
+            finally:
+                queues[0].put(_END_OF_STREAM)
+
+        def work(stage, in_q, out_q):
+            # Once a step fails, the items still coming are discarded, so that
+            # the previous steps are not blocked.
+            try:
+                item_name, *parameters = stage._parameters
+                step_parameters = self._build_params(
+                    {p: stage._parameters[p] for p in parameters},
+                    stage.arguments, stage._prebound)
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                errors.append(e)
+                failed.set()
+            while (item := in_q.get()) is not _END_OF_STREAM:
+                if failed.is_set():
+                    continue
+                try:
+                    out_q.put(stage._method_call(
+                        **{item_name: item}, **step_parameters))
+                except Exception as e:  # pylint: disable=broad-exception-caught
+                    errors.append(e)
+                    failed.set()
+            out_q.put(_END_OF_STREAM)
+
+        self.logger.info('Stream execution started')
+        threads = [threading.Thread(target=feed, daemon=True)]
+        threads += [
+            threading.Thread(
+                target=work, args=(stage, queues[i], queues[i + 1]), daemon=True)
+            for i, stage in enumerate(stages)]
+        for thread in threads:
+            thread.start()
+
+        results = []
+        while (item := queues[-1].get()) is not _END_OF_STREAM:
+            results.append(item)
+        for thread in threads:
+            thread.join()
+        if errors:
+            raise errors[0]
+        self.logger.info('Stream execution finished')
+        return results
+
+    def compile(self):
+        """
+        Compile the pipeline into a single function that runs its stages one
+        after another, so that running the pipeline does not iterate over the
+        list of stages. `run()` compiles the pipeline the first time it is
+        called, and again if the list of stages, or any stage in it, changes.
+
+        If the pipeline has `max_workers`, the dependencies between its stages
+        are computed instead, to run them concurrently.
+        """
+        if self.max_workers is not None:
+            self._dependencies = self._stage_dependencies()
+            self._run_compiled = Pipeline._run_concurrently
+            self._compiled_stages = tuple(self.pipeline)
+            return
+
+        namespace = {f"s{i}": stage for i, stage in enumerate(self.pipeline)}
+        lines = ["def _run_compiled(self):",
+                 "    run_stage = self._run_stage"]
+        lines += [f"    run_stage(s{i}, {i})" for i in range(len(self.pipeline))]
+        exec(compile("\n".join(lines), "<pipeline>", "exec"), namespace)
+
+        self._run_compiled = namespace["_run_compiled"]
+        self._compiled_stages = tuple(self.pipeline)
+
+    def _stage_dependencies(self) -> list:
+        """
+        Compute the stages each stage of the pipeline depends on. A stage reads
+        the objects passed in its arguments, the host attributes named as its
+        parameters, the object of a dotted method and those in `depends_on`, and
+        writes its attribute. It must run after the previous stages that write
+        what it reads, or that read or write what it writes. Stages that are not
+        resolved yet depend on all the previous ones, since what they read is not
+        known.
+
+        Returns
+        -------
+        dependencies: list
+            For each stage, the set with the positions of the stages it depends on.
+        """
+        reads, writes, dependencies = [], [], []
+        for i, stage in enumerate(self.pipeline):
+            if stage._parameters is None:
+                stage_reads = None
+            else:
+                stage_reads = set(stage._parameters)
+                if stage.arguments is not None:
+                    stage_reads.update(
+                        v for v in stage.arguments.values() if isinstance(v, str))
+                if self._is_dotted(stage):
+                    stage_reads.add(stage.method_name.split('.', 1)[0])
+                if stage.depends_on is not None:
+                    stage_reads.update(stage.depends_on)
+            stage_writes = set() if stage.attribute_name is None else \
+                {stage.attribute_name}
+
+            if stage_reads is None:
+                dependencies.append(set(range(i)))
+            else:
+                dependencies.append({
+                    j for j in range(i)
+                    if writes[j] & (stage_reads | stage_writes) or
+                    (stage_writes and
+                     (reads[j] is None or stage_writes & reads[j]))})
+            reads.append(stage_reads)
+            writes.append(stage_writes)
+
+        return dependencies
+
+    def _run_concurrently(self):
+        """
+        Run the stages of the pipeline in a pool of threads, submitting each
+        stage as soon as all the stages it depends on have finished.
+        """
+        waiting = [set(d) for d in self._dependencies]
+        dependents = [[] for _ in self.pipeline]
+        for i, stage_dependencies in enumerate(waiting):
+            for j in stage_dependencies:
+                dependents[j].append(i)
+
+        num_done = 0
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            running = {
+                executor.submit(self._run_stage, self.pipeline[i], None): i
+                for i, stage_dependencies in enumerate(waiting)
+                if not stage_dependencies}
+            while running:
+                done, _ = concurrent.futures.wait(
+                    running, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    i = running.pop(future)
+                    future.result()
+                    num_done += 1
+                    self._pbar_step(num_done)
+                    for k in dependents[i]:
+                        waiting[k].discard(i)
+                        if not waiting[k]:
+                            running[executor.submit(
+                                self._run_stage, self.pipeline[k], None)] = k
+
+    def _run_stage(self, stage: Stage, stage_nr: int):
+        """
+        Run a single stage of the pipeline.
+
+        Parameters
+        ----------
+        stage: Stage
+            The stage to be run.
+        stage_nr: int
+            The position of the stage in the pipeline, or None if the progress
+            bar is updated by the caller.
+        """
+        tracing = self._tracing()
+        if tracing:
             self._m(f"  > Step #{stage._num:>03d}({stage._id})\n"
                     f"    > attribute_name: {stage.attribute_name}\n"
                     f"    > method_name: {stage.method_name}\n"
                     f"    > class_name: {stage.class_name}\n"
                     f"    > arguments: {stage.arguments}")
-            # Check if step_name is a method within Host, or in globals
-            stage._method_call = self._get_callable_method(
-                stage.method_name, stage.class_name)
-            stage._parameters = self._get_method_signature(stage._method_call)
-
-            # If step_parameters has 'self' as first key, remove it.
-            if 'self' in stage._parameters.keys():
-                stage._parameters.pop('self')
-
-            # Given the parameters that the method accepts and the arguments
-            # passed for the method, build the parameters to be passed to the
-            # method, using default values or values from the host object.
+        # Resolve the method to be called only the first time the stage is
+        # run. Dotted names refer to objects created at run time, so they
+        # must be bound again on every run, using the getter from the stage.
+        if stage._method_call is None:
+            self._resolve_stage(stage)
+        elif stage._obj_getter is not None:
+            stage._method_call = stage._obj_getter(
+                self._get_object(stage._obj_name))
+
+        # Given the parameters that the method accepts and the arguments
+        # passed for the method, build the parameters to be passed to the
+        # method, using default values or values from the host object.
+        # Stages with a runner build them and call the method in one go,
+        # once the runner is generated again if the stage changed since.
+        runner = stage._runner
+        if stage._runner_inputs is not None and \
+                not self._runner_is_current(stage):
+            runner = stage._runner = self._stage_runner(stage)
+        if runner is None:
             step_parameters = self._build_params(
-                stage._parameters, stage.arguments)
-
-            self.logger.info("Running step #%03d(%s) started",
-                             stage._num, stage._id)
-            stage._timestamp_start = time.time()
-            return_value = self._run_step(stage._method_call, step_parameters)
-            stage._timestamp_end = time.time()
-            stage._duration = stage._timestamp_end - stage._timestamp_start
-            self.logger.info("Running step #%03d(%s) finished",
-                             stage._num, stage._id)
-
-            # If return value needs to be stored in a variable, do it.
-            if stage.attribute_name is not None:
-                # If host is None, I assign the return value to the global variable
-                if self.host is None:
-                    self.attributes_[stage.attribute_name] = return_value
-                    # globals()[stage.attribute_name] = return_value
-                else:
-                    setattr(self.host, stage.attribute_name, return_value)
-                # Check if the new attribute created is an object and if so,
-                # add it to the list of objects.
-                if not isinstance(return_value, type):
-                    self.objects_[stage.attribute_name] = return_value
+                stage._parameters, stage.arguments, stage._prebound)
+
+        self.logger.info("Running step #%03d(%s) started",
+                         stage._num, stage._id)
+        stage._timestamp_start = time.time()
+        if runner is not None:
+            return_value = runner(self.host, self.objects_, stage._method_call)
+            if tracing:
+                self._m(f"      > Return value: {type(return_value)}")
+        elif stage.memoize:
+            return_value = self._run_memoized(stage, step_parameters)
+        else:
+            return_value = self._call_stage(stage, step_parameters)
+        stage._timestamp_end = time.time()
+        stage._duration = stage._timestamp_end - stage._timestamp_start
+        self.logger.info("Running step #%03d(%s) finished",
+                         stage._num, stage._id)
+
+        # If return value needs to be stored in a variable, do it.
+        if stage.attribute_name is not None:
+            # If host is None, I assign the return value to the global variable
+            if self.host is None:
+                self.attributes_[stage.attribute_name] = return_value
+                # globals()[stage.attribute_name] = return_value
+            else:
+                setattr(self.host, stage.attribute_name, return_value)
+            # Check if the new attribute created is an object and if so,
+            # add it to the list of objects.
+            if not isinstance(return_value, type):
+                self.objects_[stage.attribute_name] = return_value
+            if tracing:
                 self._m(f"      New attribute: <{stage.attribute_name}>")
 
-            print("-"*100) if self.verbose else None
-            self._pbar_update(self.description, stage_nr + 1)
+        if self.verbose:
+            print(_SEPARATOR)
+        if stage_nr is not None:
+            self._pbar_step(stage_nr + 1)
 
-        self._pbar_close()
-        ProgBar.clear()
-        self.logger.info('Pipeline execution finished')
-        self.run_ = True
+    def _prepare_stage(self, stage: Stage):
+        """
+        Resolve a stage when it is added to the pipeline, if possible, so that
+        running the pipeline does not need to do it. Stages whose method cannot
+        be found yet, like those calling objects created by previous steps, are
+        resolved the first time they run.
+
+        Parameters
+        ----------
+        stage: Stage
+            The stage to be resolved.
+        """
+        if self._is_dotted(stage) or \
+                (stage.method_name is None and stage.class_name is None):
+            return
+        method_call = self._get_callable_method(
+            stage.method_name, stage.class_name)
+        if method_call is None:
+            return
+        try:
+            parameters = self._get_method_signature(method_call)
+        except (TypeError, ValueError):
+            return
+        parameters.pop('self', None)
+        stage._method_call, stage._parameters = method_call, parameters
+        stage._prebound = self._prebind(parameters)
+        stage._kind = self._stage_kind(stage)
+        self._jit_stage(stage)
+        stage._runner = self._stage_runner(stage)
+
+    def _resolve_stage(self, stage: Stage):
+        """
+        Resolve the callable of a stage and the parameters it accepts, and store
+        them in the stage itself, so that they can be reused in later runs.
+
+        Parameters
+        ----------
+        stage: Stage
+            The stage to be resolved.
+        """
+        # Check if step_name is a method within Host, or in globals
+        stage._method_call = self._get_callable_method(
+            stage.method_name, stage.class_name)
+        stage._parameters = self._get_method_signature(stage._method_call)
+
+        # If step_parameters has 'self' as first key, remove it.
+        if 'self' in stage._parameters.keys():
+            stage._parameters.pop('self')
+
+        # Keep the name of the object and the getter of its method for stages
+        # of the form `object.method`, to bind them again in later runs.
+        if self._is_dotted(stage):
+            stage._obj_name, attr_path = stage.method_name.split('.', 1)
+            stage._obj_getter = _attr_getter(attr_path)
+        stage._prebound = self._prebind(stage._parameters)
+        stage._kind = self._stage_kind(stage)
+        self._jit_stage(stage)
+        stage._runner = self._stage_runner(stage)
+
+    @staticmethod
+    def _prebind(method_parameters: dict) -> dict:
+        """
+        Get the values in globals of the parameters of a stage, once, when the
+        stage is resolved, so that running it does not look them up again.
+        """
+        prebound = {}
+        for parameter in method_parameters:
+            value = _global(parameter, _MISSING)
+            if value is not _MISSING:
+                prebound[parameter] = value
+        return prebound
+
+    @staticmethod
+    def _stage_runner(stage: Stage) -> Callable:
+        """
+        Generate a function that builds the parameters of a resolved stage and
+        calls its method with them, following the same rules as `_build_params`,
+        but with the source of each parameter decided once, when the stage is
+        resolved: an argument, a host attribute, a global, or a default value.
+        The function is called with the host object, the objects created by the
+        pipeline and the method of the stage. The arguments and the `memoize`
+        flag it was generated for are kept in the stage, so that
+        `_runner_is_current` can tell when it must be generated again.
+
+        Parameters
+        ----------
+        stage: Stage
+            The stage to generate the function for.
+
+        Returns
+        -------
+        runner: Callable
+            The generated function, or None if the stage must be run through
+            `_build_params`, because it is memoized, its callable is not a
+            function or a class, or it has arguments its method does not accept.
+        """
+        parameters = stage._parameters
+        arguments = stage.arguments if stage.arguments is not None else {}
+        stage._runner_inputs = (
+            stage.memoize,
+            dict(arguments) if isinstance(arguments, dict) else arguments)
+        if stage.memoize or stage._kind is None or parameters is None or \
+                not isinstance(arguments, dict) or \
+                any(argument not in parameters for argument in arguments):
+            return None
+
+        namespace = {'_MISSING': _MISSING}
+        lines = ["def _runner(host, objects, method_call):"]
+        for i, (parameter, default_value) in enumerate(parameters.items()):
+            if parameter in arguments:
+                namespace[f"c{i}"] = arguments[parameter]
+                # Strings can be names of objects or host attributes, while
+                # other values are always passed as they are.
+                if isinstance(arguments[parameter], str):
+                    lines += [f"    v{i} = objects.get(c{i}, _MISSING)",
+                              f"    if v{i} is _MISSING:",
+                              f"        v{i} = getattr(host, c{i}, c{i})"]
+                else:
+                    lines += [f"    v{i} = c{i}"]
+                continue
+
+            lines += [f"    v{i} = getattr(host, {parameter!r}, _MISSING)",
+                      f"    if v{i} is _MISSING:"]
+            if parameter in stage._prebound:
+                namespace[f"c{i}"] = stage._prebound[parameter]
+            elif default_value is not inspect.Parameter.empty:
+                namespace[f"c{i}"] = default_value
+            else:
+                lines += [f"        raise ValueError(\"Parameter '{parameter}' "
+                          f"not found in host object or globals\")"]
+                continue
+            lines += [f"        v{i} = c{i}"]
+
+        call = ", ".join(
+            f"{parameter}=v{i}" for i, parameter in enumerate(parameters))
+        lines += [f"    return method_call({call})"]
+        exec(compile("\n".join(lines), f"<stage {stage._id}>", "exec"), namespace)
+        return namespace["_runner"]
+
+    @staticmethod
+    def _runner_is_current(stage: Stage) -> bool:
+        """
+        Check that the arguments and the `memoize` flag of a stage are still the
+        ones its runner was generated for. Values are compared by identity,
+        since the runner holds the very objects passed as arguments.
+        """
+        memoize, arguments = stage._runner_inputs
+        current = stage.arguments if stage.arguments is not None else {}
+        if stage.memoize != memoize or not isinstance(current, dict) or \
+                len(current) != len(arguments):
+            return False
+        return all(arguments.get(k, _MISSING) is v for k, v in current.items())
+
+    def _stage_kind(self, stage: Stage) -> int:
+        """
+        Classify the callable of a resolved stage, to know how to run it.
+
+        Parameters
+        ----------
+        stage: Stage
+            The stage to be classified.
+
+        Returns
+        -------
+        kind: int
+            One of the `_KIND_*` constants, or None if the callable must be run
+            through `_run_step`, which raises the appropriate error for it.
+        """
+        method_call = stage._method_call
+        if inspect.isclass(method_call):
+            return _KIND_CLASS
+        if not isinstance(method_call, (types.FunctionType, types.MethodType)):
+            return None
+        if self._is_dotted(stage):
+            return _KIND_DOTTED
+        if self.host is not None and \
+                getattr(method_call, '__self__', None) is self.host:
+            return _KIND_HOST_METHOD
+        return _KIND_FUNCTION
+
+    def _jit_stage(self, stage: Stage):
+        """
+        Compile the function of a stage marked with `jit` using Numba, keeping
+        the compiled code in Numba's disk cache. Only plain functions, like the
+        static methods of the host, can be compiled. Otherwise, or if Numba is not
+        installed, the stage runs as regular Python code.
+
+        Stages that do not set `jit` follow the `jit` flag of the pipeline, and
+        run as regular Python code, silently, if their function cannot be
+        compiled.
+
+        Parameters
+        ----------
+        stage: Stage
+            The stage to be compiled.
+        """
+        if stage.jit is None:
+            if not self.jit or numba is None or stage._kind != _KIND_FUNCTION or \
+                    not isinstance(stage._method_call, types.FunctionType):
+                return
+            stage._method_call = _njit_or_python(stage._method_call)
+            return
+        if not stage.jit:
+            return
+        if numba is None:
+            self.logger.warning(
+                "Numba is not installed, stage #%03d(%s) is not compiled",
+                stage._num, stage._id)
+            return
+        if stage._kind != _KIND_FUNCTION or \
+                not isinstance(stage._method_call, types.FunctionType):
+            self.logger.warning(
+                "Only functions can be compiled, stage #%03d(%s) is not",
+                stage._num, stage._id)
+            return
+        stage._method_call = _njit(stage._method_call)
+
+    def _call_stage(self, stage: Stage, step_parameters: dict) -> Any:
+        """
+        Call the method of a resolved stage. Functions and methods are called,
+        and classes are instantiated, in the same way; stages without a kind
+        go through `_run_step`.
+        """
+        if stage._kind is None:
+            return self._run_step(stage._method_call, step_parameters)
+        return_value = stage._method_call(**step_parameters)
+        if self._tracing():
+            self._m(f"      > Return value: {type(return_value)}")
+        return return_value
+
+    @staticmethod
+    def _is_dotted(stage: Stage) -> bool:
+        """
+        Check if the method of a stage is of the form `object.method`.
+        """
+        return stage.class_name is None and stage.method_name is not None and \
+            '.' in stage.method_name
+
+    def _get_object(self, obj_name: str) -> Any:
+        """
+        Get an object by its name, either from the host object or from the
+        objects created by the previous steps of the pipeline.
+        """
+        obj = getattr(self.host, obj_name, _MISSING)
+        if obj is not _MISSING:
+            return obj
+        if obj_name in self.objects_:
+            return self.objects_[obj_name]
+        raise ValueError(
+            f"Object {obj_name} not found in host object")
 
     def _get_step_components(self, forge_step: tuple, stage: Stage):
         """
@@ -317,6 +1367,7 @@ class Pipeline:
 
         stage.attribute_name, stage.method_name, stage.class_name, stage.arguments = \
             self._parse_step(forge_step)
+        stage.arguments = _intern_arguments(stage.arguments)
 
         return stage
 
@@ -334,11 +1385,17 @@ class Pipeline:
         method_parameters: dict
             A dictionary containing the method's parameters and their default values.
         """
-        parameters = inspect.signature(method_call).parameters
-        if parameters is None:
-            return None
-
-        return {arg: parameters[arg].default for arg in parameters.keys()}
+        # Bound methods share the cached signature of their function, without
+        # the argument they are bound to.
+        func = getattr(method_call, '__func__', None)
+        try:
+            if func is not None:
+                return dict(_signature_defaults(func, bound=True))
+            return dict(_signature_defaults(method_call))
+        except TypeError:
+            # Unhashable callables cannot be cached
+            parameters = inspect.signature(method_call).parameters
+            return {name: p.default for name, p in parameters.items()}
 
     def _parse_step(self, forge_step):
         """
@@ -373,10 +1430,13 @@ class Pipeline:
             A 4-tuple with the attribute name, the method name, the class name
             and the parameters.
         """
-        self._m(f"    > Into '{self._parse_step.__name__}' "
-                f"with forge_step='{forge_step}'")
+        if self._tracing():
+            self._m(f"    > Into '{self._parse_step.__name__}' "
+                    f"with forge_step='{forge_step}'")
 
-        attribute_name, method_name, class_name, parameters = None, None, None, None
+        # A single method name, the most common step, is all there is to parse.
+        if type(forge_step) is str:
+            return (None, sys.intern(forge_step), None, None)
         if not isinstance(forge_step, (tuple)):
             forge_step = (forge_step,)
 
@@ -384,84 +1444,20 @@ class Pipeline:
         assert len(forge_step) > 0 and len(forge_step) < 5, \
             f"Tuple '{forge_step}' must have between 1 and 4 elements"
 
-        # Checks---------------------------------------------------------------
-        # 'method_name'
-        # ClassHolder
-        # ('method_name')
-        # (ClassHolder)
-        if len(forge_step) == 1:
-            if isinstance(forge_step[0], str):
-                method_name = forge_step[0]
-            elif isinstance(forge_step[0], type):
-                class_name = forge_step[0]
-            else:
-                raise ValueError(
-                    f"Parameter \'{forge_step}\' must be a string or a class")
-        # Checks---------------------------------------------------------------
-        # ('method_name', ClassHolder)
-        # ('new_attribute', 'method_name')
-        # ('new_attribute', ClassHolder)
-        # ('method_name', {'param1': 'value1'})
-        elif len(forge_step) == 2:
-            if isinstance(forge_step[1], type):
-                # Check if the first element is a method name or an attribute name
-                if isinstance(forge_step[0], str) and \
-                        self._get_callable_method(
-                            forge_step[0], forge_step[1]) is not None:
-                    method_name, class_name = forge_step
-                elif isinstance(forge_step[0], str) and \
-                        self._get_callable_method(forge_step[0], forge_step[1]) is None:
-                    attribute_name, class_name = forge_step
-                else:
-                    raise ValueError(
-                        f"First element of tuple \'{forge_step}\' must be a string "
-                        f"or a method name, when the second element is a class")
-            elif isinstance(forge_step[1], dict) and isinstance(forge_step[0], str):
-                method_name, parameters = forge_step
-            elif isinstance(forge_step[0], str) and isinstance(forge_step[1], str):
-                attribute_name, method_name = forge_step
-            else:
-                raise ValueError(
-                    f"Tuple \'{forge_step}\' with 2 elements must be either "
-                    f"(str, class), (str, str) or (str, dict)")
-        # Checks---------------------------------------------------------------
-        # ('new_attribute', 'method_name',  ClassHolder)
-        # ('new_attribute', 'method_name', {'param1': 'value1'})
-        # ('new_attribute',  ClassHolder,  {'param1': 'value1'})
-        # ('method_name',    ClassHolder,  {'param1': 'value1'})
-        elif len(forge_step) == 3:
-            if isinstance(forge_step[0], str) and isinstance(forge_step[1], str):
-                if isinstance(forge_step[2], type):
-                    attribute_name, method_name, class_name = forge_step
-                elif isinstance(forge_step[2], dict):
-                    attribute_name, method_name, parameters = forge_step
-                else:
-                    raise ValueError(
-                        f"Tuple \'{forge_step}\' with 3 elements must be "
-                        f"(str, str, class) or (str, str, dict)")
-            elif self._get_callable_method(forge_step[0], forge_step[1]) is None and \
-                    isinstance(forge_step[1], type):
-                attribute_name, class_name, parameters = forge_step
-            elif self._get_callable_method(forge_step[0], forge_step[1]) is not None \
-                    and isinstance(forge_step[1], type):
-                method_name, class_name, parameters = forge_step
-            else:
-                raise ValueError(
-                    f"Tuple \'{forge_step}\' with 3 elements must be either "
-                    f"(str, str, dict) or (str, class, dict)")
-        # Checks---------------------------------------------------------------
-        # ('new_attribute', 'method_name', ClassHolder, {'param1': 'value1'})
-        # ('new_attribute', 'method_name', 'object_name', {'param1': 'value1'})
-        elif len(forge_step) == 4:
-            if isinstance(forge_step[1], str) and isinstance(forge_step[2], type) and \
-                    isinstance(forge_step[3], dict):
-                attribute_name, method_name, class_name, parameters = forge_step
-            else:
-                raise ValueError(
-                    f"Tuple \'{forge_step}\' with 4 elements must be "
-                    f"(str, str, class, dict)")
-
-        return (attribute_name, method_name, class_name, parameters)
+        # The kinds of the elements of the step tell where each one goes. A
+        # string followed by a class can either be the name of a method of the
+        # class or the name of the attribute to keep the new object in.
+        layouts = _STEP_LAYOUTS.get(tuple(map(_step_element_kind, forge_step)))
+        if layouts is None:
+            raise ValueError(_STEP_ERRORS[len(forge_step)].format(forge_step))
+        layout, alternative = layouts
+        if alternative is not None and \
+                self._get_callable_method(forge_step[0], forge_step[1]) is None:
+            layout = alternative
+
+        # Intern the names in the step, since they are used as keys in the
+        # lookups on the host object and the objects created by the pipeline.
+        return tuple(None if i is None else _intern(forge_step[i]) for i in layout)
 
     def _get_callable_method(
             self,
@@ -481,8 +1477,9 @@ class Pipeline:
         method: callable
             Method to be called, or None if the method is not found.
         """
-        self._m(f"      > Into '{self._get_callable_method.__name__}' with "
-                f"method_name='{method_name}', class_name='{class_name}'")
+        if self._tracing():
+            self._m(f"      > Into '{self._get_callable_method.__name__}' with "
+                    f"method_name='{method_name}', class_name='{class_name}'")
 
         # Assert that method_name is a string or None
         assert method_name is None or \
@@ -491,47 +1488,46 @@ class Pipeline:
 
         # If class_name is not None, check if method is a method of the class.
         if class_name is not None and inspect.isclass(class_name):
-            if method_name is not None:
-                if hasattr(class_name, method_name):
-                    return getattr(class_name, method_name)
-            else:
-                module_name = class_name.__module__
-                module = import_module(module_name)
-                return getattr(module, class_name.__name__)
-            return None
+            return _resolve_class_method(class_name, method_name)
 
         # Check if the class is a valid class
         if class_name is not None and not inspect.isclass(class_name):
             raise AttributeError(f"Parameter '{class_name}' must be a class")
 
-        # Check if 'method_name' is a method of the host object.
-        if hasattr(self.host, method_name):
-            return getattr(self.host, method_name)
+        # Check if 'method_name' is a method of the host object, binding it from
+        # its class, unless the host object has an attribute that hides it.
+        host_class = type(self.host)
+        method = _host_callable(host_class, method_name)
+        if method is not None and \
+                method_name not in getattr(self.host, '__dict__', ()):
+            return method.__get__(self.host, host_class)
+        method = getattr(self.host, method_name, _MISSING)
+        if method is not _MISSING:
+            return method
 
         # Check if 'method_name' is a method in the pipeline object.
-        if hasattr(self, method_name):
-            return getattr(self, method_name)
+        method = getattr(self, method_name, _MISSING)
+        if method is not _MISSING:
+            return method
 
         # Check if 'method_name' is a function in globals.
-        if method_name in globals():
-            return globals()[method_name]
+        method = _global(method_name, _MISSING)
+        if method is not _MISSING:
+            return method
 
         # Check if 'method_name' contains a dot (.) and if so, try to get the
         # method from the object after the dot.
         if '.' in method_name:
-            obj_name, method_name = method_name.split('.')
-            if hasattr(self.host, obj_name):
-                obj = getattr(self.host, obj_name)
-                return getattr(obj, method_name)
-            elif obj_name in self.objects_:
-                obj = self.objects_[obj_name]
-                return getattr(obj, method_name)
-            raise ValueError(
-                f"Object {obj_name} not found in host object")
+            obj_name, attr_path = method_name.split('.', 1)
+            return _attr_getter(attr_path)(self._get_object(obj_name))
 
         return None
 
-    def _build_params(self, method_parameters, method_arguments) -> dict:
+    def _build_params(
+            self,
+            method_parameters,
+            method_arguments,
+            prebound: dict = None) -> dict:
         """
         This method builds the parameters to be passed to the method, using default
         values or values from the host object.
@@ -542,6 +1538,9 @@ class Pipeline:
             Dictionary containing the parameters that the method accepts.
         method_arguments: dict
             Dictionary containing the arguments to be passed to the method.
+        prebound: dict
+            Values in globals of the parameters, as computed by `_prebind`. If
+            None, parameters are looked up in globals.
 
         Returns
         -------
@@ -549,11 +1548,13 @@ class Pipeline:
             Dictionary containing the parameters to be passed to the method.
 
         """
-        self._m(
-            f"        > Into '{self._build_params.__name__}' with "
-            f"method_parameters='{method_parameters}', "
-            f"method_arguments='{method_arguments}'")
+        if self._tracing():
+            self._m(
+                f"        > Into '{self._build_params.__name__}' with "
+                f"method_parameters='{method_parameters}', "
+                f"method_arguments='{method_arguments}'")
 
+        get_global = _global if prebound is None else prebound.get
         params = {}
         for parameter, default_value in method_parameters.items():
             if method_arguments is not None:
@@ -563,30 +1564,28 @@ class Pipeline:
                     # Two possibilities here: either the parameter is a normal value,
                     # in which case we simply take it, or is the name of an object
                     # created in a previous step, in which case we take the object.
-                    # But first, check if the parameter is hashable.
-                    if not isinstance(method_arguments[parameter], typing.Hashable):
-                        params[parameter] = method_arguments[parameter]
-                        continue
-                    if method_arguments[parameter] in self.objects_:
-                        params[parameter] = self.objects_[
-                            method_arguments[parameter]]
-                    # XXX experimental
-                    elif isinstance(method_arguments[parameter], str):
-                        if hasattr(self.host, method_arguments[parameter]):
-                            params[parameter] = getattr(
-                                self.host, method_arguments[parameter])
-                        else: # It's a literal string
-                            params[parameter] = method_arguments[parameter]
+                    # Values that cannot be hashed are never names of objects.
+                    argument = method_arguments[parameter]
+                    try:
+                        value = self.objects_.get(argument, _MISSING)
+                    except TypeError:
+                        value = argument
                     # XXX experimental
-                    else:
-                        params[parameter] = method_arguments[parameter]
+                    if value is _MISSING:
+                        if isinstance(argument, str):
+                            # If not a host attribute, it's a literal string
+                            value = getattr(self.host, argument, argument)
+                        else:
+                            value = argument
+                    params[parameter] = value
                     continue
 
             # But always, try to get the parameter from the host object or globals.
-            if hasattr(self.host, parameter):
-                params[parameter] = getattr(self.host, parameter)
-            elif parameter in globals():
-                params[parameter] = globals()[parameter]
+            value = getattr(self.host, parameter, _MISSING)
+            if value is _MISSING:
+                value = get_global(parameter, _MISSING)
+            if value is not _MISSING:
+                params[parameter] = value
             # or if the parameter has a default value, use it.
             elif default_value is not inspect.Parameter.empty:
                 params[parameter] = default_value
@@ -630,8 +1629,10 @@ class Pipeline:
             list_of_params = []
 
         # Check if step_name is a function or a class already in globals
-        if step_name in globals():
-            step_name = globals()[step_name]
+        step_global = _global(step_name, _MISSING) \
+            if isinstance(step_name, str) else _MISSING
+        if step_global is not _MISSING:
+            step_name = step_global
             # check if type of step_name is a function
             if isinstance(step_name, (types.FunctionType, types.MethodType)):
                 return_value = step_name(**list_of_params)
@@ -654,8 +1655,9 @@ class Pipeline:
             else:
                 raise TypeError("step_name must be a class or a function")
         # Check if step_name is a method of the host object
-        elif hasattr(self.host, step_name):
-            step_name = getattr(self.host, step_name)
+        elif (host_method := getattr(self.host, step_name, _MISSING)) \
+                is not _MISSING:
+            step_name = host_method
             # check if type of step_name is a function
             if isinstance(step_name, (types.FunctionType, types.MethodType)):
                 return_value = step_name(**list_of_params)
@@ -669,24 +1671,102 @@ class Pipeline:
             if '.' not in step_name:
                 raise ValueError(
                     f"step_name ({step_name}) must be object's method: object.method")
-            method_call = step_name
-            root_object = self.host
-            while '.' in method_call:
-                call_composition = step_name.split('.')
-                obj_name = call_composition[0]
-                method_name = method_name = '.'.join(call_composition[1:])
-                obj = getattr(root_object, obj_name)
-                call_name = getattr(obj, method_name)
-                method_call = '.'.join(method_name.split('.')[1:])
+            obj_name, attr_path = step_name.split('.', 1)
+            call_name = _attr_getter(attr_path)(self._get_object(obj_name))
             return_value = call_name(**list_of_params)
 
-        self._m(f"      > Return value: {type(return_value)}")
+        if self._tracing():
+            self._m(f"      > Return value: {type(return_value)}")
+        return return_value
+
+    def _run_memoized(self, stage: Stage, step_parameters: dict) -> Any:
+        """
+        Run a memoized stage. If the same callable has already been called with
+        the same arguments, by this or any other pipeline, the value returned
+        then is reused and the call is skipped. Memoized stages must therefore be
+        pure: their result can only depend on their arguments.
+
+        Parameters
+        ----------
+        stage: Stage
+            The stage to be run.
+        step_parameters: dict
+            Parameters to be passed to the method of the stage.
+
+        Returns
+        -------
+        return_value: any
+            Value returned by the method of the stage, or the memoized one.
+        """
+        key = self._memo_key(stage._method_call, step_parameters)
+        if key is None:
+            return self._call_stage(stage, step_parameters)
+        owners = self._memo_owners(stage._method_call)
+        with Pipeline._memo_lock:
+            entry = Pipeline._memo.get(key)
+            # The owners are compared too, since their ids in the key can be
+            # reused by new objects once they are gone. Entries keep them alive
+            # until they are evicted.
+            if entry is not None and entry[0][0] is owners[0] and \
+                    entry[0][1] is owners[1]:
+                Pipeline._memo.move_to_end(key)
+                self._m(f"      > Memoized value for step #{stage._num:>03d}")
+                return entry[1]
+
+        return_value = self._call_stage(stage, step_parameters)
+        with Pipeline._memo_lock:
+            Pipeline._memo[key] = (owners, return_value)
+            Pipeline._memo.move_to_end(key)
+            while len(Pipeline._memo) > Pipeline._memo_size:
+                Pipeline._memo.popitem(last=False)
         return return_value
 
+    @staticmethod
+    def _memo_owners(method_call: Callable) -> tuple:
+        """
+        Get the function and the object a method is bound to, or the callable
+        itself and None, which identify the call being memoized.
+        """
+        func = getattr(method_call, '__func__', None)
+        if func is None:
+            return (method_call, None)
+        return (func, method_call.__self__)
+
+    @staticmethod
+    def _memo_key(method_call: Callable, step_parameters: dict) -> bytes:
+        """
+        Compute the key used to memoize the call to a method, from the identity
+        of its function and of the object it is bound to, if any, and the
+        arguments passed to it. Different objects of the same class, or closures
+        with the same qualified name, get different keys. Returns None if the
+        arguments cannot be serialized.
+        """
+        func, owner = Pipeline._memo_owners(method_call)
+        try:
+            # Protocol 5 serializes buffers, like NumPy arrays, without copies.
+            payload = pickle.dumps(
+                (id(func), id(owner), sorted(step_parameters.items())),
+                protocol=5)
+        except (pickle.PicklingError, TypeError, AttributeError):
+            return None
+        return _digest(payload)
+
+    @classmethod
+    def clear_memo(cls):
+        """
+        Remove all the values memoized by the pipelines.
+        """
+        with cls._memo_lock:
+            cls._memo.clear()
+
     def show(self):
         """
         Show the pipeline. Print cards with the steps and the description of each step.
         """
+        # Only needed here, so they are not imported along with the module.
+        from rich.columns import Columns  # pylint: disable=import-outside-toplevel
+        from rich.table import Table  # pylint: disable=import-outside-toplevel
+
         columns_layout = []
         table = []
         num_stages = len(self.pipeline)
@@ -696,20 +1776,20 @@ class Pipeline:
                 f"[white]Stage #{i}, id: #{self.pipeline[i]._id}[/white]",
                 justify="left", no_wrap=True)
             line = ""
-            # Loop through the elements of the stage tuple
-            for k, v in asdict(self.pipeline[i]).items():
-                if k == '_num' or k == '_id' or k == '_method_call' or \
-                    k == "_parameters" or k == "_timestamp_start" or \
-                        k == "_timestamp_end" or k == "_duration" or v is None:
+            # Loop through the elements of the stage, without copying them
+            stage = self.pipeline[i]
+            for k, v in ((f.name, getattr(stage, f.name)) for f in dataclasses.fields(stage)):
+                # Private fields are internal to the execution of the stage.
+                if k.startswith('_') or v is None:
                     continue
                 if isinstance(v, dict) and v:
                     line += f"[yellow1]{k}[/yellow1]:\n"
                     for k1, v1 in v.items():
-                        line += f"- [orange1]{k1}[/orange1]: {v1}\n"
+                        line += f"- [orange1]{k1}[/orange1]: {_summary(v1)}\n"
                 elif isinstance(v, type):
                     line += f"[yellow1]{k}[/yellow1]: {v.__name__}\n"
                 else:
-                    line += f"[yellow1]{k}[/yellow1]: {v}\n"
+                    line += f"[yellow1]{k}[/yellow1]: {_summary(v)}\n"
 
             # Remove trailing newline from `line`
             line = line.rstrip("\n")
@@ -778,9 +1858,9 @@ class Pipeline:
             stage._id = step_id
             for k, v in step_contents.items():
                 if k == 'attribute':
-                    stage.attribute_name = v
+                    stage.attribute_name = sys.intern(v)
                 elif k == 'method':
-                    stage.method_name = v
+                    stage.method_name = sys.intern(v)
                 elif k == 'class':
                     try:
                         stage.class_name = getattr(module, v)
@@ -788,10 +1868,17 @@ class Pipeline:
                         raise AttributeError(
                             f"Class '{v}' not found in module '{module}'") from exc
                 elif k == 'arguments':
-                    stage.arguments = v
+                    stage.arguments = _intern_arguments(v)
+                elif k == 'memoize':
+                    stage.memoize = v
+                elif k == 'jit':
+                    stage.jit = v
+                elif k == 'depends_on':
+                    stage.depends_on = v
                 else:
                     raise ValueError(
                         f"Key '{k}' not recognized in the configuration")
+            self._prepare_stage(stage)
             steps.append(stage)
 
         self._m(f"> Processed {len(steps)} steps")
@@ -810,9 +1897,9 @@ class Pipeline:
             return self.attributes_[attribute_name]
         raise AttributeError(f"Attribute '{attribute_name}' not found")
 
-    def _pbar_create(self, name: str, num_steps: int) -> ProgBar:
+    def _pbar_create(self, name: str, num_steps: int) -> 'ProgBar':
         """
-            Creates a progress bar using the tqdm library.
+            Creates a progress bar using the ProgBar class.
 
             The progress bar is used to track the progress of the pipeline execution.
 
@@ -825,9 +1912,19 @@ class Pipeline:
                 A ProgBar object.
         """
         if len(self.pipeline) == 0 or self.silent or not self.prog_bar:
+            # Without a bar, the stages call a no-op instead of checking for
+            # one on every step.
+            self.pbar = None
+            self._pbar_step = _no_op
             return None
+        # rich's progress display is imported with the first bar.
+        from mlforge.progbar import ProgBar  # pylint: disable=import-outside-toplevel
         self.pbar = ProgBar(
             name=name, num_steps=num_steps, verbose=self.verbose)
+        # With a bar, they call its own method directly, with the name of the
+        # bar bound, as `_pbar_update` would.
+        self._pbar_step = functools.partial(
+            self.pbar.update_subtask, "subtask_0" if name is None else name)
 
         return self.pbar
 
@@ -852,12 +1949,21 @@ class Pipeline:
             return
         self.pbar.remove(self.description)
 
+    def _tracing(self) -> bool:
+        """
+        Check if the messages passed to `_m` are printed or logged, so that the
+        code run for every stage can skip formatting them otherwise.
+        """
+        return self.verbose or self.logger.isEnabledFor(logging.DEBUG)
+
     def _m(self, m: str):
         """
         Printout message if verbose is set to True, and log.debug the message.
         """
         if self.verbose:
             print(m)
+        if not self.logger.isEnabledFor(logging.DEBUG):
+            return
         m = m.replace('  ', '')
         m = m.replace('> ', '')
         # Remove any newline character from the message
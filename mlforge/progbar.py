@@ -1,4 +1,5 @@
 # This is the general idea, but with a generic nesteable class
+import threading
 from dataclasses import dataclass
 from rich.progress import (
     BarColumn,
@@ -8,32 +9,54 @@ from rich.progress import (
     TimeElapsedColumn,
     TimeRemainingColumn,
 )
-from time import sleep
+from time import monotonic, sleep
 
 
 class Singleton(type):
     _instances = {}
 
     def __call__(cls, *args, **kwargs):
-        if cls not in cls._instances:
-            cls._instances[cls] = super(
+        # A single lookup when the instance exists, which is the common case.
+        instance = cls._instances.get(cls)
+        if instance is None:
+            instance = cls._instances[cls] = super(
                 Singleton, cls).__call__(*args, **kwargs)
-        return cls._instances[cls]
+        return instance
 
     def clear(cls):
         cls._instances = {}
 
 
-@dataclass
+@dataclass(slots=True)
 class Entry:
     id: int
     name: str
     steps: int
     progress: float
+    parent: 'Entry' = None
+    label: str = None
+    is_middle: bool = False
+    upper_steps: tuple = None
+    inv_steps: float = None
+
+
+class _Progress(Progress):
+    """
+    Progress display that calls `on_render` before drawing the bars, from the
+    thread that refreshes it.
+    """
+
+    def __init__(self, *columns, on_render=None, **kwargs):
+        self.on_render = on_render
+        super().__init__(*columns, **kwargs)
+
+    def get_renderables(self):
+        if self.on_render is not None:
+            self.on_render()
+        yield from super().get_renderables()
 
 
 class ProgBar(metaclass=Singleton):
-    stack = []
     progress = None
 
     def __init__(
@@ -41,19 +64,34 @@ class ProgBar(metaclass=Singleton):
             name: str = None,
             num_steps: int = None,
             max_descr_len: int = 30,
-            verbose: bool = False):
+            verbose: bool = False,
+            min_interval: float = 0.016):
         self.verbose = verbose
         self.max_descr_len = max_descr_len
-
-        pb_name = name if name else "Progress"
-        pb_name = pb_name[:max_descr_len] + \
-            '.' if len(pb_name) > max_descr_len else pb_name
-        if len(pb_name) < max_descr_len:
-            pb_name = pb_name + "." * (max_descr_len - len(pb_name))
+        # Updates of the last bar closer in time than this are merged into one.
+        self.min_interval = min_interval
+        self._pending = None
+        self._last_flush = 0.0
+        # Held while updating the bars, since the display applies the pending
+        # update from its own thread.
+        self._lock = threading.RLock()
+
+        # Bars in the stack, and their indexes by name and by task id, so that
+        # updates do not scan the stack to find them.
+        self.stack = []
+        self._idx_by_name = {}
+        self._by_id = {}
+        # For each bar in the stack, how much the bars above it advance with
+        # each of its steps. It only changes when bars are added or removed.
+        self._advances = []
+        # Index of the last bar in the stack, the only one that advances the
+        # bars above it.
+        self._top_idx = -1
+        self._started = False
 
         description = "[progress.description]{{task.description:<{}s}}".format(
             self.max_descr_len)
-        self.progress = Progress(
+        self.progress = _Progress(
             TextColumn(description),
             TextColumn("•"),
             TextColumn("[progress.percentage]{task.percentage:>3.0f}%"),
@@ -63,62 +101,142 @@ class ProgBar(metaclass=Singleton):
             TimeElapsedColumn(),
             TextColumn("•"),
             TimeRemainingColumn(),
-            transient=True)
+            transient=True,
+            auto_refresh=True,
+            refresh_per_second=10,
+            on_render=self._flush_if_idle)
         self.start_subtask(name, num_steps)
         self.main_task = self.stack[0].id
 
     def start_subtask(self, name: str = None, steps: int = None):
+        # Stages run concurrently can start and remove bars at the same time.
+        with self._lock:
+            return self._start_subtask(name, steps)
+
+    def _start_subtask(self, name, steps):
         assert steps is not None, "The total number of steps must be provided"
+        self._flush_pending()
         if name is None:
             name = f"subtask_{len(self.stack)}"
-        id = self.progress.add_task(name, total=steps)
-        self.stack.append(Entry(id, name, steps, 0.0))
-        self.progress.update(id, completed=0)
-
-        self._m(f"STARTING '{name}' with {steps} steps")
-
-        if not self.verbose:
+        label = self._pad(name)
+        id = self.progress.add_task(label, total=steps)
+        entry = Entry(
+            id, name, steps, 0.0, self.stack[-1] if self.stack else None, label,
+            inv_steps=1 / steps)
+        self.stack.append(entry)
+        self._top_idx = len(self.stack) - 1
+        self._idx_by_name.setdefault(name, self._top_idx)
+        self._by_id[id] = entry
+        self._advances.append(self._ancestor_advances(entry))
+        self._set_middle_flags()
+
+        if self.verbose:
+            self._m(f"STARTING '{name}' with {steps} steps")
+
+        # The live display is started along with the first bar only.
+        if not self.verbose and not self._started:
             self.progress.start()
+            self._started = True
 
         return self
 
-    def update_subtask(self, name, steps):
+    def update_subtask(self, name, steps, force: bool = False):
+        with self._lock:
+            self._update_subtask(name, steps, force)
+
+    def _update_subtask(self, name, steps, force):
         idx = self._get_idx(name)
         assert idx != - 1,\
             f"Element '{name}' NOT found. Available pbars are: {[n.name for n in self.stack]}"
 
-        stack_element = self._get_element_by_name(name)
-        self.progress.update(stack_element.id, completed=steps, refresh=True)
-        change_in_pbar = (steps - stack_element.progress) != 0.0
-        upper_steps = self._upper_steps(name)
-
-        # Guess if this is last element in the stack, by checking if the
-        # name corresponds to the last element in the stack
-        last_pbar_in_stack = name == self.stack[-1].name
-
-        stack_element.progress = steps
-        self._log_update(name, steps, idx, change_in_pbar, upper_steps)
+        stack_element = self.stack[idx]
+        # Only the last element in the stack advances the bars above it.
+        last_pbar_in_stack = idx == self._top_idx
+
+        # Updates of any other bar must see the ones pending.
+        pending = self._pending
+        if pending is not None and pending[1] is not stack_element:
+            self._flush_pending()
+            pending = None
+
+        last_steps = stack_element.progress if pending is None else pending[2]
+        change_in_pbar = (steps - last_steps) != 0.0
+        # Nothing to draw, nor to propagate to the upper bars, if the bar does
+        # not move, unless a redraw is forced.
+        if not change_in_pbar:
+            if force:
+                self._flush_pending()
+                self.progress.refresh()
+            return
 
-        if upper_steps is None or not last_pbar_in_stack:
-            self._m(f"   (leaving update)\n")
-            self._reset_if_completed(idx)
+        # Updates of the last bar that come too fast are merged, keeping only
+        # the last one, since the upper bars advance with the steps done.
+        now = monotonic()
+        if last_pbar_in_stack and not self.verbose and not force and \
+                now - self._last_flush < self.min_interval:
+            self._pending = (idx, stack_element, steps)
             return
 
-        multiplier = (1 / stack_element.steps)
-        for i, n_steps in enumerate(upper_steps):
-            upper_task_id = self.stack[idx - (i + 1)].id
-            upper_stack_element = self._get_element(upper_task_id)
-            percentage = (multiplier * (1 / n_steps)) * upper_stack_element.steps
-            self.progress.update(
-                upper_task_id, advance=percentage, refresh=True)
-            upper_stack_element.progress += percentage
-            multiplier = multiplier * (1 / n_steps)
+        self._pending = None
+        self._last_flush = now
+        self._apply_update(idx, stack_element, steps, last_pbar_in_stack)
+
+    def _flush_pending(self):
+        """
+        Apply the updates of the last bar merged and not drawn yet, if any.
+        """
+        with self._lock:
+            if self._pending is None:
+                return
+            idx, stack_element, steps = self._pending
+            self._pending = None
+            self._last_flush = monotonic()
+            self._apply_update(idx, stack_element, steps, True)
+
+    def _flush_if_idle(self):
+        """
+        Apply the pending update before the display draws the bars, so that it
+        does not stay behind when no other update comes, unless the bars are
+        being updated right now.
+        """
+        if self._pending is None or not self._lock.acquire(blocking=False):
+            return
+        try:
+            self._flush_pending()
+        finally:
+            self._lock.release()
+
+    def _apply_update(self, idx, stack_element, steps, last_pbar_in_stack):
+        advances = self._advances[idx] if last_pbar_in_stack else ()
+        # The bars above advance with the steps done since the last update, so
+        # that updating every few steps moves them as much as every step.
+        delta = steps - stack_element.progress
+
+        # No forced redraw: the live display refreshes itself periodically.
+        # Updates are already serialized by `self._lock`, held by the callers.
+        self.progress.update(stack_element.id, completed=steps)
+        for upper_stack_element, percentage in advances:
+            advance = percentage * delta
+            self.progress.update(upper_stack_element.id, advance=advance)
+            upper_stack_element.progress += advance
 
-            self._log_advance(upper_task_id, percentage)
+        stack_element.progress = steps
+        if self.verbose:
+            upper_steps = self._upper_steps(stack_element.name, idx)
+            self._log_update(stack_element, steps, True, upper_steps)
+            if not advances:
+                self._m("   (leaving update)\n")
+            for upper_stack_element, percentage in advances:
+                self._log_advance(upper_stack_element, percentage * delta)
 
-        self._reset_if_completed(idx)
+        self._reset_if_completed(stack_element)
 
     def remove(self, name: str):
+        with self._lock:
+            self._remove(name)
+
+    def _remove(self, name):
+        self._flush_pending()
         idx = self._get_idx(name)
         if idx == -1:
             self._m(f"Element '{name}' NOT found")
@@ -127,48 +245,90 @@ class ProgBar(metaclass=Singleton):
             self._m("Cannot remove first element when len > 1")
             return
 
-        stack_element = self._get_element_by_name(name)
+        stack_element = self.stack[idx]
         self.progress.remove_task(stack_element.id)
         del self.stack[idx]
-
+        self._top_idx = len(self.stack) - 1
+        del self._by_id[stack_element.id]
+        self._idx_by_name = {}
+        for i, element in enumerate(self.stack):
+            self._idx_by_name.setdefault(element.name, i)
+
+        # Unlink the bar from the one below it, which are the only ones whose
+        # advances change.
+        if idx < len(self.stack):
+            self.stack[idx].parent = stack_element.parent
+        del self._advances[idx]
+        self._advances[idx:] = [
+            self._ancestor_advances(e) for e in self.stack[idx:]]
+        self._set_middle_flags()
+
+        # Since updates do not force a redraw, the state left by the removed
+        # bar is drawn now.
         if len(self.stack) == 0:
             self.progress.stop()
             self.progress = None
+            self._started = False
+        else:
+            self.progress.refresh()
 
         self._m(f"Element '{name}' REMOVED")
         self._m(f"  Stack contains {len(self.stack)} elements")
         return
 
-    def _upper_steps(self, name: str):
-        idx = self._get_idx(name)
+    def _upper_steps(self, name: str, idx: int = None):
+        if idx is None:
+            idx = self._get_idx(name)
         if idx == 0:
             self._m(f"Element '{name}' is the TOP one")
             return None
         if idx == -1:
             self._m(f"Element '{name}' NOT found")
             return None
-        upper_bars_steps = [
-            self.stack[i].steps for i in range(idx - 1, -1, -1)]
-        return upper_bars_steps
+        return self.stack[idx].upper_steps
+
+    def _pad(self, name: str) -> str:
+        """
+        Fit the name of a bar to the width of the description column, cutting
+        it, or filling it with dots.
+        """
+        if len(name) > self.max_descr_len:
+            return name[:self.max_descr_len - 1] + '.'
+        return name.ljust(self.max_descr_len, '.')
+
+    @staticmethod
+    def _ancestor_advances(stack_element: Entry) -> list:
+        """
+        Compute how much each bar above the given one advances when it advances
+        one step, from the closest to the top one, following the parents. The
+        steps of those bars are kept in the entry, for the trace messages.
+        """
+        advances = []
+        # The reciprocals of the steps are computed once, with each entry.
+        multiplier = stack_element.inv_steps
+        upper_stack_element = stack_element.parent
+        while upper_stack_element is not None:
+            inv_steps = upper_stack_element.inv_steps
+            percentage = (multiplier * inv_steps) * upper_stack_element.steps
+            advances.append((upper_stack_element, percentage))
+            multiplier = multiplier * inv_steps
+            upper_stack_element = upper_stack_element.parent
+        stack_element.upper_steps = tuple(e.steps for e, _ in advances) or None
+        return advances
 
     def _get_idx(self, name):
-        idx = next(
-            (i for i, element in enumerate(self.stack) if element.name == name), -1
-        )
-        return idx
+        return self._idx_by_name.get(name, -1)
 
     def _get_element(self, id):
-        return next(
-            (element for element in self.stack if element.id == id), None
-        )
+        return self._by_id.get(id)
 
     def _get_element_by_name(self, name):
-        return next(
-            (element for element in self.stack if element.name == name), None
-        )
+        idx = self._idx_by_name.get(name)
+        return None if idx is None else self.stack[idx]
 
-    def _log_advance(self, upper_task_id, percentage):
-        stck_element = self._get_element(upper_task_id)
+    def _log_advance(self, stck_element, percentage):
+        if not self.verbose:
+            return
         self._m(
             f"-> Advancing '{stck_element.name}' by {percentage:.4f}"
             f" steps  (progress: {stck_element.progress:.4f} / "
@@ -178,8 +338,10 @@ class ProgBar(metaclass=Singleton):
         else:
             self._m("")
 
-    def _log_update(self, name, steps, idx, change_in_pbar, upper_steps):
-        stack_element = self._get_element_by_name(name)
+    def _log_update(self, stack_element, steps, change_in_pbar, upper_steps):
+        if not self.verbose:
+            return
+        name = stack_element.name
         self._m(
             f"Updating '{name}' (id={stack_element.id}) with {steps} steps"
             f" (progress: {stack_element.progress:.4f}) / {stack_element.steps}"
@@ -191,15 +353,20 @@ class ProgBar(metaclass=Singleton):
         else:
             self._m("")
 
-    def _reset_if_completed(self, idx):
-        stack_element = self._get_element(idx)
-        if stack_element is None:
-            return
-
-        if (idx > 0) and (idx < len(self.stack) - 1) and \
+    def _set_middle_flags(self):
+        """
+        Flag the bars that are neither the top nor the bottom one of the stack,
+        which are reset when they complete.
+        """
+        last = len(self.stack) - 1
+        for i, stack_element in enumerate(self.stack):
+            stack_element.is_middle = 0 < i < last
+
+    def _reset_if_completed(self, stack_element):
+        if stack_element.is_middle and \
                 stack_element.progress >= stack_element.steps:
             self._m("\nUPON CONDITION")
-            self.progress.update(stack_element.id, completed=0, refresh=True)
+            self.progress.update(stack_element.id, completed=0)
             stack_element.progress = 0.
 
     def _m(self, str="", **kwargs):
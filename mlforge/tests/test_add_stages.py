@@ -12,14 +12,8 @@ Tests for the add_stages method.
 # pylint: disable=W0612:unused-variable, E0602:undefined-variable
 # pylint: disable=C0413:wrong-import-position
 
-import os
-import sys
 import string
 
-
-sys.path.insert(0, os.path.abspath(
-    os.path.join(os.path.dirname(__file__), '../mlforge')))
-
 from mlforge.mlforge import Pipeline, Stage
 
 class TestAddStages:
@@ -63,3 +57,12 @@ class TestAddStages:
             assert isinstance(stage._id, str)
             assert len(stage._id) == 8
             assert all(c in string.hexdigits for c in stage._id)
+
+    def test_stage_key(self):
+        stage = Stage(attribute_name='a', method_name='m', arguments={'x': 1})
+        same = Stage(attribute_name='a', method_name='m', arguments={'x': 1})
+        other = Stage(attribute_name='a', method_name='m', arguments={'x': 2})
+
+        assert Pipeline._stage_key(stage) == Pipeline._stage_key(same)
+        assert Pipeline._stage_key(stage) != Pipeline._stage_key(other)
+        assert Pipeline._stage_key(Stage(arguments={'x': [1]})) is None
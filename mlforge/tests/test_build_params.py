@@ -12,15 +12,8 @@ Tests for the build_params method.
 # pylint: disable=W0612:unused-variable, E0602:undefined-variable
 # pylint: disable=C0413:wrong-import-position
 
-import os
-import sys
-
 import pytest
 
-
-sys.path.insert(0, os.path.abspath(
-    os.path.join(os.path.dirname(__file__), '../mlforge')))
-
 from mlforge.mlforge import Pipeline
 
 
@@ -104,3 +97,13 @@ class Test_BuildParams:
         params = pipeline._build_params(method_parameters, method_arguments)
 
         assert params == {'param1': 'value1', 'param2': 'value2'}
+
+    # Passes unhashable arguments, even nested in a tuple, as they are
+    def test_build_params_with_unhashable_arguments(self):
+        method_parameters = {'p1': None, 'p2': None}
+        method_arguments = {'p1': [1, 2], 'p2': ([3], 4)}
+
+        pipeline = Pipeline()
+        params = pipeline._build_params(method_parameters, method_arguments)
+
+        assert params == {'p1': [1, 2], 'p2': ([3], 4)}
@@ -11,11 +11,7 @@ Tests for the parse_step method.
 # pylint: disable=W0106:expression-not-assigned, R1702:too-many-branches
 # pylint: disable=C0413:wrong-import-position
 
-import os
-import sys
-
-sys.path.insert(0, os.path.abspath(
-    os.path.join(os.path.dirname(__file__), '../mlforge')))
+from unittest import mock
 
 from mlforge.mlforge import Pipeline
 
@@ -78,3 +74,80 @@ class TestCallableMethod:
         # Test case 4: method_name is not found
         method = forge._get_callable_method("nonexistent_method")
         assert method is None
+
+    def test_get_callable_method_from_host_class(self):
+        class Host(SomeClass):
+            @property
+            def expensive(self):
+                raise RuntimeError("Properties must not be evaluated")
+
+            @staticmethod
+            def static_method():
+                return 1
+
+        host = Host()
+        forge = Pipeline(host=host)
+
+        # Methods are bound to the host object, without evaluating properties
+        assert forge._get_callable_method("method_name").__self__ is host
+        assert forge._get_callable_method("static_method")() == 1
+
+        # Attributes of the host object hide the methods of its class
+        host.method_name = "value"
+        assert forge._get_callable_method("method_name") == "value"
+
+    def test_get_callable_method_sees_patched_methods(self):
+        class Host(SomeClass):
+            def fit(self):
+                return "original"
+
+        host = Host()
+        assert Pipeline(host=host)._get_callable_method("fit")() == "original"
+
+        # Methods patched or reassigned on the class are used by new pipelines
+        with mock.patch.object(Host, "fit", return_value="patched"):
+            assert Pipeline(host=host)._get_callable_method("fit")() == "patched"
+        Host.fit = lambda self: "reassigned"
+        assert Pipeline(host=host)._get_callable_method("fit")() == "reassigned"
+
+    def test_get_callable_method_sees_methods_defined_in_subclasses(self):
+        class Base:
+            def fit(self):
+                return "base"
+
+        class Middle(Base):
+            pass
+
+        class Host(Middle):
+            pass
+
+        host = Host()
+        assert Pipeline(host=host)._get_callable_method("fit")() == "base"
+
+        # A method defined later, closer to the class, hides the cached one
+        Middle.fit = lambda self: "middle"
+        assert Pipeline(host=host)._get_callable_method("fit")() == "middle"
+        del Middle.fit
+        assert Pipeline(host=host)._get_callable_method("fit")() == "base"
+
+    def test_get_callable_method_sees_patched_class_methods(self):
+        class Holder:
+            @staticmethod
+            def method():
+                return "original"
+
+        forge = Pipeline()
+        assert forge._get_callable_method("method", Holder)() == "original"
+        with mock.patch.object(Holder, "method", return_value="patched"):
+            assert forge._get_callable_method("method", Holder)() == "patched"
+
+    def test_get_callable_method_sees_classes_rebound_in_their_module(self):
+        forge = Pipeline()
+        original = SomeClass
+        assert forge._get_callable_method(None, original) is original
+
+        # Classes are taken from their module, even after being resolved once
+        replacement = type("SomeClass", (), {"__module__": __name__})
+        with mock.patch(f"{__name__}.SomeClass", replacement):
+            assert forge._get_callable_method(None, original) is replacement
+        assert forge._get_callable_method(None, original) is original
@@ -12,12 +12,8 @@ Test the read of the configuration file and the creation of the pipeline
 # pylint: disable=W0212:protected-access, C0413:wrong-import-position
 
 import os
-import sys
 
-sys.path.insert(0, os.path.abspath(
-    os.path.join(os.path.dirname(__file__), '../mlforge')))
-
-from mlforge.mlforge import Pipeline, Stage
+from mlforge.mlforge import Pipeline, Stage, _read_config
 
 
 class HostClass:
@@ -141,3 +137,63 @@ class Test_ProcessConfig:
 
         assert isinstance(steps, list)
         assert len(steps) == 0
+
+
+class Test_LoadConfig:
+    """
+    Test the method `Pipeline._load_config()`.
+    """
+
+    # The second load of an unchanged file comes from the cache.
+    def test_config_is_cached(self, tmp_path, monkeypatch):
+        monkeypatch.setenv('MLFORGE_CACHE_DIR', str(tmp_path / 'cache'))
+        config_filename = tmp_path / 'config.yml'
+        config_filename.write_text("step1:\n  method: host_method\n")
+
+        pipeline = Pipeline(HostClass(), prog_bar=False)
+        config = pipeline._load_config(str(config_filename))
+        assert config == {'step1': {'method': 'host_method'}}
+        assert len(os.listdir(tmp_path / 'cache')) == 1
+
+        def fail(*args, **kwargs):
+            raise AssertionError("YAML file parsed again")
+        monkeypatch.setattr('mlforge.mlforge.yaml.load', fail)
+
+        # Loaded from the cache file, when it's not in memory.
+        _read_config.cache_clear()
+        assert pipeline._load_config(str(config_filename)) == config
+
+        # Loaded from memory, even without the cache file.
+        for cache_file in (tmp_path / 'cache').iterdir():
+            cache_file.unlink()
+        assert pipeline._load_config(str(config_filename)) == config
+        assert pipeline._load_config(str(config_filename)) is not config
+        pipeline.close()
+
+    # A modified file is parsed again.
+    def test_modified_config_is_parsed(self, tmp_path, monkeypatch):
+        monkeypatch.setenv('MLFORGE_CACHE_DIR', str(tmp_path / 'cache'))
+        config_filename = tmp_path / 'config.yml'
+        config_filename.write_text("step1:\n  method: host_method\n")
+
+        pipeline = Pipeline(HostClass(), prog_bar=False)
+        pipeline._load_config(str(config_filename))
+        config_filename.write_text("step1:\n  method: other_method\n")
+        os.utime(config_filename, ns=(0, 0))
+        config = pipeline._load_config(str(config_filename))
+        assert config == {'step1': {'method': 'other_method'}}
+        pipeline.close()
+
+    # Without a cache folder, nothing is written to disk.
+    def test_config_is_not_cached_on_disk_by_default(self, tmp_path, monkeypatch):
+        monkeypatch.delenv('MLFORGE_CACHE_DIR', raising=False)
+        monkeypatch.setenv('HOME', str(tmp_path / 'home'))
+        config_filename = tmp_path / 'config.yml'
+        config_filename.write_text("step1:\n  method: host_method\n")
+
+        pipeline = Pipeline(HostClass(), prog_bar=False)
+        config = pipeline._load_config(str(config_filename))
+        assert config == {'step1': {'method': 'host_method'}}
+        assert not (tmp_path / 'home').exists()
+        assert sorted(os.listdir(tmp_path)) == ['config.yml']
+        pipeline.close()
@@ -12,12 +12,6 @@ Tests the get_method_signature method of the Pipeline class.
 # pylint: disable=missing-function-docstring, C0413:wrong-import-position
 # pylint: disable=W0212:protected-access, W0613:unused-argument
 
-import os
-import sys
-
-sys.path.insert(0, os.path.abspath(
-    os.path.join(os.path.dirname(__file__), '../mlforge')))
-
 import inspect
 from mlforge.mlforge import Pipeline
 
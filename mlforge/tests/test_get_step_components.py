@@ -13,14 +13,8 @@ Test the from_list method of the Pipeline class.
 # pylint: disable=missing-function-docstring
 # pylint: disable=W0212:protected-access, C0413:wrong-import-position
 
-import os
-import sys
-
 import pytest
 
-sys.path.insert(0, os.path.abspath(
-    os.path.join(os.path.dirname(__file__), '../mlforge')))
-
 from mlforge.mlforge import Stage, Pipeline
 
 
@@ -11,13 +11,8 @@ Tests for the parse_step method.
 # pylint: disable=W0106:expression-not-assigned, R1702:too-many-branches
 # pylint: disable=C0413:wrong-import-position
 
-import os
-import sys
 import pytest
 
-sys.path.insert(0, os.path.abspath(
-    os.path.join(os.path.dirname(__file__), '../mlforge')))
-
 from mlforge.mlforge import Pipeline
 
 # Used to test access to global classes
@@ -34,8 +29,49 @@ def global_method():
     pass
 
 
+# Steps and the 4-tuple of attribute name, method name, class name and
+# arguments they are parsed into.
+CASES = [
+    # Test case 1: step_name is a string
+    ("step_name", (None, "step_name", None, None)),
+    # Test case 1b: step_name is a string
+    (("method_name"), (None, "method_name", None, None)),
+    # Test case 1c: step_name is a class
+    ((SomeClass), (None, None, SomeClass, None)),
+    # Test case 2: step_name is a tuple with length 2
+    (("attribute_name", "method_name"),
+     ("attribute_name", "method_name", None, None)),
+    # Test case 2: the method does not exists, so the __init__ method should be called.
+    (("attribute_name", SomeClass), ("attribute_name", None, SomeClass, None)),
+    # Test case 2b: step_name is a tuple with length 2
+    (("method_name", SomeClass), (None, "method_name", SomeClass, None)),
+    # Test case 2c: step_name is a tuple with length 2
+    (("method_name", {"param": "value"}),
+     (None, "method_name", None, {"param": "value"})),
+    # Test case 3: step_name is a tuple with length 3
+    (("method_name", SomeClass, {"param": "value"}),
+     (None, "method_name", SomeClass, {"param": "value"})),
+    # Test case 3b: step_name is a tuple with length 3
+    (("attribute_name", "method_name", {"param": "value"}),
+     ("attribute_name", "method_name", None, {"param": "value"})),
+    # Test case 3c: step_name is a tuple with length 3
+    (("attribute_name", SomeClass, {"param": "value"}),
+     ("attribute_name", None, SomeClass, {"param": "value"})),
+    # Test case 4: step_name is a tuple with length 4
+    (("attribute_name", "method_name", SomeClass, {"param": "value"}),
+     ("attribute_name", "method_name", SomeClass, {"param": "value"})),
+]
+
+
+@pytest.fixture(scope="module")
+def forge():
+    # Parsing does not change the pipeline, so all the cases share it.
+    return Pipeline()
+
+
 class Test_ParseStep:
-    def test_parse_step(self):
+    @pytest.mark.parametrize("spec,expected", CASES)
+    def test_parse_step(self, forge, spec, expected):
         """
         Depending on the length, we can have different scenarios:
 
@@ -56,99 +92,9 @@ class Test_ParseStep:
             ('new_attribute', 'method_name', ClassHolder, {'param1': 'value1'})
 
         """
-        forge = Pipeline()
-
-        # Test case 1: step_name is a string
-        attribute_name, method_name, class_name, arguments = forge._parse_step(
-            "step_name")
-        assert attribute_name is None
-        assert method_name == "step_name"
-        assert class_name is None
-        assert arguments is None
-
-        # Test case 1b: step_name is a string
-        attribute_name, method_name, class_name, arguments = forge._parse_step(
-            ("method_name"))
-        assert attribute_name is None
-        assert method_name == "method_name"
-        assert class_name is None
-        assert arguments is None
-
-        # Test case 1b: step_name is a string
-        attribute_name, method_name, class_name, arguments = forge._parse_step(
-            (SomeClass))
-        assert attribute_name is None
-        assert method_name is None
-        assert class_name == SomeClass
-        assert arguments is None
-
-        # Test case 2: step_name is a tuple with length 2
-        attribute_name, method_name, class_name, arguments = forge._parse_step(
-            ("attribute_name", "method_name"))
-        assert attribute_name == "attribute_name"
-        assert method_name == "method_name"
-        assert class_name is None
-        assert arguments is None
-
-        # Test case 2: the method does not exists, so the __init__ method should be called.
-        attribute_name, method_name, class_name, arguments = forge._parse_step(
-            ("attribute_name", SomeClass))
-        assert attribute_name == "attribute_name"
-        assert method_name is None
-        assert class_name == SomeClass
-        assert arguments is None
-
-        # Test case 2b: step_name is a tuple with length 2
-        attribute_name, method_name, class_name, arguments = forge._parse_step(
-            ("method_name", SomeClass))
-        assert attribute_name is None
-        assert method_name == "method_name"
-        assert class_name == SomeClass
-        assert arguments is None
-
-        # Test case 2c: step_name is a tuple with length 2
-        attribute_name, method_name, class_name, arguments = forge._parse_step(
-            ("method_name", {"param": "value"}))
-        assert attribute_name is None
-        assert method_name == "method_name"
-        assert class_name is None
-        assert arguments == {"param": "value"}
-
-        # Test case 3: step_name is a tuple with length 3
-        attribute_name, method_name, class_name, arguments = forge._parse_step(
-            ("method_name", SomeClass, {"param": "value"}))
-        assert attribute_name is None
-        assert method_name == "method_name"
-        assert class_name == SomeClass
-        assert arguments == {"param": "value"}
-
-        # Test case 3b: step_name is a tuple with length 3
-        attribute_name, method_name, class_name, arguments = forge._parse_step(
-            ("attribute_name", "method_name", {"param": "value"}))
-        assert attribute_name == "attribute_name"
-        assert method_name == "method_name"
-        assert class_name is None
-        assert arguments == {"param": "value"}
-
-        # Test case 3c: step_name is a tuple with length 3
-        attribute_name, method_name, class_name, arguments = forge._parse_step(
-            ("attribute_name", SomeClass, {"param": "value"}))
-        assert attribute_name == "attribute_name"
-        assert method_name is None
-        assert class_name == SomeClass
-        assert arguments == {"param": "value"}
-
-        # Test case 4: step_name is a tuple with length 4
-        attribute_name, method_name, class_name, arguments = forge._parse_step(
-            ("attribute_name", "method_name", SomeClass, {"param": "value"}))
-        assert attribute_name == "attribute_name"
-        assert method_name == "method_name"
-        assert class_name == SomeClass
-        assert arguments == {"param": "value"}
-
-    def test_parse_step_raises_value_error(self):
-        forge = Pipeline()
+        assert forge._parse_step(spec) == expected
 
+    def test_parse_step_raises_value_error(self, forge):
         # Test case 1: step_name is empty
         with pytest.raises(AssertionError):
             forge._parse_step(())
@@ -12,37 +12,179 @@ Tests for the progress bar functionality in the Pipeline class.
 # pylint: disable=missing-function-docstring
 # pylint: disable=W0212:protected-access, C0413:import-misplaced
 
-import os
-import sys
+import threading
 
-sys.path.insert(0, os.path.abspath(
-    os.path.join(os.path.dirname(__file__), '../mlforge')))
+import pytest
 
-from mlforge.mlforge import Pipeline
+from mlforge.mlforge import Pipeline, _no_op
+from mlforge.progbar import ProgBar
+
+
+@pytest.fixture(scope="module")
+def shared_pipeline():
+    pipeline = Pipeline()
+    yield pipeline
+    pipeline.close()
+
+
+@pytest.fixture
+def forge(shared_pipeline):
+    # The pipeline is shared by the tests, which only change its stages and
+    # its progress bar, so those are reset after each one.
+    yield shared_pipeline
+    pbar = shared_pipeline.pbar
+    if pbar is not None:
+        for stack_element in reversed(pbar.stack):
+            pbar.remove(stack_element.name)
+    shared_pipeline.pipeline = []
+    shared_pipeline.pbar = None
+    ProgBar.clear()
 
 
 class Test_PbarUpdate:
 
     # Creates a progress bar with the total number of steps in the pipeline.
-    def test_progress_bar_creation(self):
-        pipeline = Pipeline()
-        pipeline.pipeline = [1, 2, 3, 4, 5]
-        pipeline._pbar_create("main", len(pipeline.pipeline))
-        assert pipeline.pbar.progress._tasks[0].total == len(pipeline.pipeline)
-        pipeline.close()
+    def test_progress_bar_creation(self, forge):
+        forge.pipeline = [1, 2, 3, 4, 5]
+        forge._pbar_create("main", len(forge.pipeline))
+        assert forge.pbar.progress._tasks[0].total == len(forge.pipeline)
 
     # The pipeline has no steps, so the progress bar is not created.
-    def test_no_progress_bar_creation(self):
-        pipeline = Pipeline()
-        pipeline._pbar_create("main", len(pipeline.pipeline))
-        assert pipeline.pbar is None
-        pipeline.close()
+    def test_no_progress_bar_creation(self, forge):
+        forge._pbar_create("main", len(forge.pipeline))
+        assert forge.pbar is None
 
     # Can update the progress bar by a step of 1
-    def test_update_progress_bar_by_step_of_1(self):
-        pipeline = Pipeline()
-        pipeline.pipeline = [1, 2, 3, 4, 5]
-        pipeline._pbar_create("main", len(pipeline.pipeline))
-        pipeline._pbar_update("main", 1)
-        assert pipeline.pbar.progress._tasks[0].completed == 1
+    def test_update_progress_bar_by_step_of_1(self, forge):
+        forge.pipeline = [1, 2, 3, 4, 5]
+        forge._pbar_create("main", len(forge.pipeline))
+        forge._pbar_update("main", 1)
+        assert forge.pbar.progress._tasks[0].completed == 1
+
+    # Disabling the bar drops the one created before, and makes the stages call
+    # a no-op, leaving the methods that update it untouched.
+    def test_disabled_progress_bar_is_dropped(self, forge):
+        forge.pipeline = [1, 2, 3, 4, 5]
+        pbar = forge._pbar_create("main", len(forge.pipeline))
+        assert forge._pbar_step.func == pbar.update_subtask
+        forge._pbar_step(1)
+        assert pbar.progress._tasks[0].completed == 1
+        forge.prog_bar = False
+        try:
+            assert forge._pbar_create("main", len(forge.pipeline)) is None
+        finally:
+            forge.prog_bar = True
+        assert forge.pbar is None
+        assert forge._pbar_step is _no_op
+        assert '_pbar_update' not in vars(forge)
+        forge._pbar_update("main", 1)
+        forge._pbar_close()
+        pbar.remove("main")
+
+    # A run that shows a bar clears it when it finishes, and one that does not
+    # show a bar leaves the bars of other pipelines alone.
+    def test_run_clears_only_the_bars_it_created(self):
+        class Host:
+            def method(self):
+                return 1
+
+        pipeline = Pipeline(host=Host())
+        pipeline.from_list([('result', 'method')])
+        pipeline.run()
+        assert isinstance(pipeline.pbar, ProgBar)
+        assert ProgBar not in ProgBar._instances
+
+        pbar = ProgBar(name="other", num_steps=1)
+        quiet = Pipeline(host=Host(), prog_bar=False)
+        quiet.from_list([('result', 'method')])
+        quiet.run()
+        assert quiet.pbar is None
+        assert ProgBar._instances.get(ProgBar) is pbar
+        pbar.remove("other")
+        ProgBar.clear()
+        pipeline.close()
+        quiet.close()
+
+
+class Test_ProgBar:
+
+    # Completing a subtask advances the bar above it by one step.
+    def test_subtask_advances_upper_bar(self):
+        ProgBar.clear()
+        pbar = ProgBar("main", 2, min_interval=0)
+        pbar.start_subtask("sub", 4)
+        for step in range(4):
+            pbar.update_subtask("sub", step + 1)
+        assert pbar._get_element_by_name("main").progress == 1.0
+
+        pbar.remove("sub")
+        assert pbar._get_idx("sub") == -1
+        assert pbar._get_element(pbar.main_task).name == "main"
+        pbar.remove("main")
+        ProgBar.clear()
+
+    # Fast updates of the last bar are merged, and applied before the bar is
+    # removed.
+    def test_fast_updates_are_merged(self):
+        ProgBar.clear()
+        pbar = ProgBar("main", 2, min_interval=60)
+        pbar.start_subtask("sub", 4)
+        for step in range(4):
+            pbar.update_subtask("sub", step + 1)
+        sub = pbar._get_element_by_name("sub")
+        assert sub.progress == 1
+        assert pbar._pending[2] == 4
+
+        pbar.remove("sub")
+        assert pbar._get_element_by_name("main").progress == 1.0
+        assert pbar.progress._tasks[pbar.main_task].completed == 1.0
+        pbar.remove("main")
+        ProgBar.clear()
+
+    # Updating a subtask every few steps advances the bar above it by the steps
+    # done, not by the number of updates.
+    def test_batched_updates_advance_upper_bar_by_steps(self):
+        ProgBar.clear()
+        pbar = ProgBar("main", 1, min_interval=0)
+        pbar.start_subtask("sub", 1000)
+        for step in range(10, 1001, 10):
+            pbar.update_subtask("sub", step)
+        assert pbar._get_element_by_name("main").progress == pytest.approx(1.0)
+        assert pbar.progress._tasks[pbar.main_task].completed == \
+            pytest.approx(1.0)
+
+        pbar.remove("sub")
+        pbar.remove("main")
+        ProgBar.clear()
+
+    # Stages run concurrently can start, update and remove subtasks of the same
+    # bar at the same time.
+    def test_concurrent_stages_share_the_bar(self):
+        barrier = threading.Barrier(2, timeout=5)
+        stacks = []
+
+        class Host:
+            def work(self, name):
+                pbar = ProgBar().start_subtask(name, 50)
+                barrier.wait()
+                for step in range(50):
+                    pbar.update_subtask(name, step + 1)
+                stacks.append(sorted(element.name for element in pbar.stack))
+                barrier.wait()
+                pbar.remove(name)
+                stacks.append(sorted(element.name for element in pbar.stack))
+                return name
+
+        ProgBar.clear()
+        host = Host()
+        pipeline = Pipeline(host=host, description="main", max_workers=2)
+        pipeline.from_list([
+            ('first', 'work', {'name': 'first'}),
+            ('second', 'work', {'name': 'second'})
+        ])
+        pipeline.run()
+        assert (host.first, host.second) == ('first', 'second')
+        assert stacks[:2] == [["first", "main", "second"]] * 2
+        assert sorted(map(len, stacks[2:])) == [1, 2]
+        assert ["main"] in stacks[2:]
         pipeline.close()
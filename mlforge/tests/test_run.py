@@ -13,15 +13,11 @@ Tests for the RUN method.
 # pylint: disable=C0413:wrong-import-position
 
 import os
-import sys
 
 import pytest
 
-
-sys.path.insert(0, os.path.abspath(
-    os.path.join(os.path.dirname(__file__), '../mlforge')))
-
-from mlforge.mlforge import Pipeline
+from mlforge import mlforge
+from mlforge.mlforge import Pipeline, Stage
 
 
 class HostClass:
@@ -97,3 +93,411 @@ class TestRun:
         # Check if the attribute is in the host object
         assert hasattr(host, 'attribute_name')
         pipeline.close()
+
+    # Run the same pipeline twice. The callable of each stage is resolved only once,
+    # but dotted stages are bound again to the objects created in the new run.
+    def test_pipeline_reuses_resolved_stages(self):
+        class Host:
+            def method(self):
+                return 1
+        host = Host()
+
+        pipeline = Pipeline(host=host, prog_bar=False)
+        pipeline.from_list([
+            ('obj', SampleClass),
+            ('result', 'obj.method'),
+            'method'
+        ])
+        pipeline.run()
+        first_obj = host.obj
+        method_call = pipeline.pipeline[2]._method_call
+
+        pipeline.run()
+        assert pipeline.pipeline[2]._method_call is method_call
+        assert host.obj is not first_obj
+        assert host.result == 1
+        pipeline.close()
+
+    # A memoized stage called twice with the same arguments runs only once.
+    def test_memoized_stage_runs_once(self):
+        class Host:
+            def __init__(self):
+                self.calls = 0
+
+            def count(self, value):
+                self.calls += 1
+                return value
+        host = Host()
+
+        Pipeline.clear_memo()
+        pipeline = Pipeline(host=host, prog_bar=False)
+        pipeline.add_stages([
+            Stage(attribute_name='r1', method_name='count',
+                  arguments={'value': 2}, memoize=True),
+            Stage(attribute_name='r2', method_name='count',
+                  arguments={'value': 2}, memoize=True),
+            Stage(attribute_name='r3', method_name='count',
+                  arguments={'value': 3}, memoize=True)
+        ])
+        pipeline.run()
+        assert host.calls == 2
+        assert (host.r1, host.r2, host.r3) == (2, 2, 3)
+        Pipeline.clear_memo()
+        pipeline.close()
+
+    # Parameters named as the modules or names imported by mlforge keep their
+    # default values.
+    def test_parameters_do_not_take_imported_names(self):
+        class Host:
+            def fetch(self, wait=True, fields=None, queue=None, os=None):
+                return (wait, fields, queue, os)
+
+        host = Host()
+        pipeline = Pipeline(host=host, prog_bar=False)
+        pipeline.add_stages([
+            Stage(attribute_name='result', method_name='fetch')
+        ])
+        pipeline.run()
+        assert host.result == (True, None, None, None)
+        assert pipeline._build_params(
+            {'wait': True, 'fields': None}, None) == {'wait': True, 'fields': None}
+        pipeline.close()
+
+    # Memoized methods of different host objects do not share their values.
+    def test_memoized_stage_is_scoped_to_its_host(self):
+        class Host:
+            def __init__(self, k):
+                self.k = k
+
+            def scale(self, x):
+                return self.k * x
+
+        Pipeline.clear_memo()
+        hosts = [Host(2), Host(10)]
+        for host in hosts:
+            pipeline = Pipeline(host=host, prog_bar=False)
+            pipeline.add_stages([
+                Stage(attribute_name='result', method_name='scale',
+                      arguments={'x': 3}, memoize=True)
+            ])
+            pipeline.run()
+            pipeline.close()
+        assert [host.result for host in hosts] == [6, 30]
+        Pipeline.clear_memo()
+
+    # Pipelines built with the same stages and arguments are shared while alive.
+    def test_get_or_build_reuses_pipelines(self):
+        def stages():
+            return [Stage(attribute_name='obj', class_name=SampleClass),
+                    Stage(attribute_name='result', method_name='obj.method')]
+
+        pipeline = Pipeline.get_or_build(stages=stages(), prog_bar=False)
+        assert Pipeline.get_or_build(stages=stages(), prog_bar=False) is pipeline
+        assert Pipeline.get_or_build(stages=stages(), silent=True) is not pipeline
+
+        pipeline.run()
+        assert pipeline.get_attribute('result') == 1
+        pipeline.close()
+
+    # Pipelines differing in the flags of their stages, or built from an edited
+    # configuration file, are not shared.
+    def test_get_or_build_keys_flags_and_files(self, tmp_path):
+        def stages(memoize):
+            return [Stage(attribute_name='obj', class_name=SampleClass,
+                          memoize=memoize)]
+
+        pipeline = Pipeline.get_or_build(stages=stages(None), prog_bar=False)
+        assert Pipeline.get_or_build(
+            stages=stages(True), prog_bar=False) is not pipeline
+
+        config_filename = tmp_path / 'config.yml'
+        config_filename.write_text("step1:\n  method: method\n")
+        from_file = Pipeline.get_or_build(str(config_filename), prog_bar=False)
+        assert Pipeline.get_or_build(
+            str(config_filename), prog_bar=False) is from_file
+        config_filename.write_text("step1:\n  method: other\n")
+        os.utime(config_filename, ns=(0, 0))
+        edited = Pipeline.get_or_build(str(config_filename), prog_bar=False)
+        assert edited is not from_file
+        assert edited.pipeline[0].method_name == 'other'
+        for p in (pipeline, from_file, edited):
+            p.close()
+
+    # The pipeline is compiled on the first run, and again when stages are added.
+    def test_pipeline_is_compiled_again_when_stages_change(self):
+        host = HostClass()
+        pipeline = Pipeline(host=host, prog_bar=False)
+        pipeline.from_list(['function1', 'function2'])
+        pipeline.run()
+        compiled = pipeline._run_compiled
+
+        pipeline.run()
+        assert pipeline._run_compiled is compiled
+
+        pipeline.add_stages([Stage(attribute_name='result', method_name='method')])
+        pipeline.run()
+        assert pipeline._run_compiled is not compiled
+        assert host.result == 1
+
+        # Stages replaced in place are run too.
+        host.result = None
+        pipeline.pipeline[2] = Stage(_num=2, _id='00000002',
+                                     attribute_name='result', method_name='method')
+        pipeline.pipeline[0] = Stage(_num=0, _id='00000000',
+                                     attribute_name='other', method_name='method')
+        pipeline.run()
+        assert host.result == 1 and host.other == 1
+        pipeline.close()
+
+    # Stages are resolved when added, and again if the host object changes.
+    def test_stages_resolved_again_when_host_changes(self):
+        class Host:
+            def __init__(self, value):
+                self.value = value
+
+            def get(self):
+                return self.value
+
+        pipeline = Pipeline(host=Host(1), prog_bar=False)
+        pipeline.from_list([('result', 'get')])
+        assert pipeline.pipeline[0]._method_call is not None
+        pipeline.run()
+        assert pipeline.host.result == 1
+
+        pipeline.host = Host(2)
+        pipeline.run()
+        assert pipeline.host.result == 2
+        pipeline.close()
+
+    # Stages are classified by the kind of callable they resolve to.
+    def test_stages_are_classified_by_kind(self):
+        host = HostClass()
+        pipeline = Pipeline(host=host, prog_bar=False)
+        pipeline.from_list([
+            ('obj', SampleClass),
+            ('result', 'obj.method'),
+            'method'
+        ])
+        pipeline.run()
+        kinds = [stage._kind for stage in pipeline.pipeline]
+        assert kinds == [mlforge._KIND_CLASS, mlforge._KIND_DOTTED,
+                         mlforge._KIND_HOST_METHOD]
+        assert host.result == 1
+        pipeline.close()
+
+    # Stages marked with `jit` return the same values, compiled or not.
+    def test_jit_stage_returns_same_value(self):
+        class Host:
+            @staticmethod
+            def square(x):
+                return x * x
+
+        host = Host()
+        pipeline = Pipeline(host=host, prog_bar=False)
+        pipeline.add_stages([
+            Stage(attribute_name='result', method_name='square',
+                  arguments={'x': 3}, jit=True)
+        ])
+        pipeline.run()
+        assert host.result == 9
+        pipeline.close()
+
+    # Pipelines with `jit` run the functions Numba cannot compile as they are.
+    def test_pipeline_jit_keeps_functions_it_cannot_compile(self):
+        class Host:
+            @staticmethod
+            def square(x):
+                return x * x
+
+            @staticmethod
+            def describe(x):
+                return type(x).__name__ + str(x)
+
+        host = Host()
+        pipeline = Pipeline(host=host, prog_bar=False, jit=True)
+        pipeline.add_stages([
+            Stage(attribute_name='result', method_name='square',
+                  arguments={'x': 3}),
+            Stage(attribute_name='text', method_name='describe',
+                  arguments={'x': 3})
+        ])
+        pipeline.run()
+        assert host.result == 9
+        assert host.text == 'int3'
+        pipeline.close()
+
+    # With Numba installed, `jit` stages run a Numba dispatcher, and pipelines
+    # with `jit` fall back to the function itself when it does not compile.
+    def test_jit_stages_are_compiled_with_numba(self):
+        numba = pytest.importorskip("numba")
+
+        class Host:
+            @staticmethod
+            def square(x):
+                return x * x
+
+            @staticmethod
+            def describe(x):
+                return type(x).__name__ + str(x)
+
+        host = Host()
+        pipeline = Pipeline(host=host, prog_bar=False)
+        pipeline.add_stages([
+            Stage(attribute_name='result', method_name='square',
+                  arguments={'x': 3}, jit=True)
+        ])
+        pipeline.run()
+        assert host.result == 9
+        assert isinstance(pipeline.pipeline[0]._method_call,
+                          numba.core.dispatcher.Dispatcher)
+        pipeline.close()
+
+        pipeline = Pipeline(host=host, prog_bar=False, jit=True)
+        pipeline.add_stages([
+            Stage(attribute_name='text', method_name='describe',
+                  arguments={'x': 3})
+        ])
+        pipeline.run()
+        call = pipeline.pipeline[0]._method_call
+        assert call.__wrapped__ is Host.describe
+        compiled = call.__closure__[call.__code__.co_freevars.index('compiled')]
+        assert compiled.cell_contents is None
+        pipeline.run()
+        assert host.text == 'int3'
+        pipeline.close()
+
+    # Stages that do not depend on each other run concurrently, and those that
+    # do run after the stages they depend on.
+    def test_pipeline_runs_independent_stages_concurrently(self):
+        class Host:
+            def __init__(self):
+                self.a = 2
+
+            def double(self, a):
+                return 2 * a
+
+            def add(self, b, c):
+                return b + c
+
+        host = Host()
+        pipeline = Pipeline(host=host, prog_bar=False, max_workers=4)
+        pipeline.add_stages([
+            Stage(attribute_name='b', method_name='double'),
+            Stage(attribute_name='c', method_name='double'),
+            Stage(attribute_name='d', method_name='add')
+        ])
+        pipeline.run()
+        assert pipeline._dependencies == [set(), set(), {0, 1}]
+        assert host.d == 8
+        pipeline.close()
+
+    # Streams run each step over every item, passing results to the next step.
+    def test_run_stream_chains_steps_over_items(self):
+        class Host:
+            def __init__(self):
+                self.items = [1, 2, 3, 4]
+                self.offset = 10
+
+            def add(self, item, offset):
+                return item + offset
+
+            def scale(self, value, factor=2):
+                return value * factor
+
+        pipeline = Pipeline(host=Host(), prog_bar=False)
+        results = pipeline.run_stream(
+            'items', ['add', ('scale', {'factor': 3})])
+        assert results == [33, 36, 39, 42]
+        pipeline.close()
+
+    # Errors raised by a step of a stream are raised by `run_stream`.
+    def test_run_stream_raises_step_errors(self):
+        class Host:
+            def __init__(self):
+                self.items = range(100)
+
+            def check(self, item):
+                if item == 5:
+                    raise KeyError(item)
+                return item
+
+        pipeline = Pipeline(host=Host(), prog_bar=False)
+        with pytest.raises(KeyError):
+            pipeline.run_stream('items', ['check'], maxsize=1)
+        pipeline.close()
+
+    # Dotted names passed to `_run_step` are resolved through nested objects.
+    def test_run_step_with_nested_dotted_name(self):
+        class Inner:
+            def method(self, value):
+                return value + 1
+
+        class Outer:
+            def __init__(self):
+                self.inner = Inner()
+
+        class Host:
+            def __init__(self):
+                self.outer = Outer()
+
+        pipeline = Pipeline(host=Host(), prog_bar=False)
+        assert pipeline._run_step('outer.inner.method', {'value': 1}) == 2
+        pipeline.close()
+
+    # Resolved stages run through a generated function that takes each parameter
+    # from the same source as `_build_params`.
+    def test_stage_runner_builds_same_parameters(self):
+        class Host:
+            def __init__(self):
+                self.b = 2
+
+            def make(self):
+                return 10
+
+            def combine(self, obj, a, b, c=3, d='literal'):
+                return (obj, a, b, c, d)
+
+        host = Host()
+        pipeline = Pipeline(host=host, prog_bar=False)
+        pipeline.from_list([
+            ('obj', 'make'),
+            ('result', 'combine', {'obj': 'obj', 'a': 1, 'd': 'b'})
+        ])
+        stage = pipeline.pipeline[1]
+        assert stage._runner is not None
+        assert pipeline._build_params(
+            stage._parameters, stage.arguments, stage._prebound) == \
+            {'obj': 'obj', 'a': 1, 'b': 2, 'c': 3, 'd': 2}
+
+        pipeline.run()
+        assert host.result == (10, 1, 2, 3, 2)
+        pipeline.close()
+
+    # Editing the arguments of a stage between runs generates its runner again,
+    # and so does turning `memoize` on or off.
+    def test_stage_runner_follows_argument_changes(self):
+        class Host:
+            def double(self, x):
+                return 2 * x
+
+        host = Host()
+        pipeline = Pipeline(host=host, prog_bar=False)
+        pipeline.from_list([('result', 'double', {'x': 1})])
+        stage = pipeline.pipeline[0]
+        pipeline.run()
+        assert host.result == 2
+
+        stage.arguments['x'] = 5
+        pipeline.run()
+        assert host.result == 10
+        assert stage._runner is not None
+
+        stage.memoize = True
+        pipeline.run()
+        assert host.result == 10
+        assert stage._runner is None
+
+        stage.memoize = False
+        pipeline.run()
+        assert stage._runner is not None
+        pipeline.close()